@@ -34,6 +34,7 @@ sys.path.insert(0, "/home/mfelkey/dev-team")
 import os
 import json
 import argparse
+import functools
 import logging
 from datetime import datetime
 from dotenv import load_dotenv
@@ -74,18 +75,25 @@ from agents.shared.knowledge_curator.evaluator import evaluate_batch
 from agents.shared.knowledge_curator.ingestion.chroma_manager import (
     get_client,
     init_collections,
-    ingest_document,
+    ingest_documents_bulk,
     purge_expired,
     get_collection_stats,
 )
 
 
+CONFIG_PATH = os.path.join(
+    os.path.dirname(__file__), "config", "knowledge_sources.json"
+)
+
+
 def load_config() -> dict:
-    """Load knowledge sources configuration."""
-    config_path = os.path.join(
-        os.path.dirname(__file__), "config", "knowledge_sources.json"
-    )
-    with open(config_path) as f:
+    """Load knowledge sources configuration (cached until the file changes)."""
+    return _load_config_cached(os.path.getmtime(CONFIG_PATH))
+
+
+@functools.lru_cache(maxsize=1)
+def _load_config_cached(mtime: float) -> dict:
+    with open(CONFIG_PATH) as f:
         return json.load(f)
 
 
@@ -217,11 +225,9 @@ def ingest_approved(evaluated_items: list[dict]) -> dict:
     """Ingest approved items into ChromaDB collections."""
     config = load_config()
     client = get_client()
-    collections = init_collections(client)
-
-    ingested_count = 0
-    collection_counts = {}
+    collections = init_collections(client, bulk_mode=True)
 
+    docs = []
     for item in evaluated_items:
         eval_result = item.get("evaluation", {})
         if not eval_result.get("ingest"):
@@ -237,19 +243,23 @@ def ingest_approved(evaluated_items: list[dict]) -> dict:
             or item.get("target_agents", ["all"])
         )
 
-        result = ingest_document(
-            collections=collections,
-            text=item["content"],
-            source_type=item["source_type"],
-            source_url=item["url"],
-            relevance_score=eval_result.get("score", 0.5),
-            target_agents=target_agents,
-            tags=item.get("tags", []),
-            title=item["title"],
-            expires_days=expires_days,
-        )
-
-        ingested_count += 1
+        docs.append({
+            "text": item["content"],
+            "source_type": item["source_type"],
+            "source_url": item["url"],
+            "relevance_score": eval_result.get("score", 0.5),
+            "target_agents": target_agents,
+            "tags": item.get("tags", []),
+            "title": item["title"],
+            "expires_days": expires_days,
+        })
+
+    # One batched upsert per collection instead of one per document
+    summaries = ingest_documents_bulk(collections=collections, docs=docs)
+
+    ingested_count = len(summaries)
+    collection_counts = {}
+    for result in summaries:
         for coll_name in result:
             collection_counts[coll_name] = collection_counts.get(coll_name, 0) + 1
 
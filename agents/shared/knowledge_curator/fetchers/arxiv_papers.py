@@ -12,11 +12,14 @@ Uses the ArXiv Atom API (no auth required, no API key).
 Filters by relevance keywords to avoid flooding ChromaDB with unrelated papers.
 """
 
+import re
+import sys
 import logging
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field, asdict
-from typing import Optional
+from functools import cached_property
+from typing import BinaryIO, Optional
 from urllib.request import urlopen, Request
 from urllib.parse import urlencode
 
@@ -72,6 +75,44 @@ CATEGORY_CONFIG = {
     },
 }
 
+# Routing values are shared by every paper in a category — freeze them into
+# interned tuples once so papers alias them instead of holding list copies.
+for _config in CATEGORY_CONFIG.values():
+    _config["target_agents"] = tuple(map(sys.intern, _config["target_agents"]))
+    _config["tags"] = tuple(map(sys.intern, _config["tags"]))
+del _config
+
+# Latest N submissions pulled per category; keyword relevance is then
+# filtered client-side so the full keyword list applies (the API query
+# syntax caps out at ~8 OR'd terms).
+ARXIV_WINDOW = 100
+
+
+def _keyword_regex(keywords: list[str]) -> re.Pattern:
+    return re.compile(
+        r"\b(?:" + "|".join(map(re.escape, keywords)) + r")\b", re.IGNORECASE
+    )
+
+
+_KEYWORD_RE = {
+    category: _keyword_regex(config["keywords"])
+    for category, config in CATEGORY_CONFIG.items()
+}
+
+# Per-category query URLs never change at runtime — encode them once.
+_ARXIV_URL_TPL = {
+    category: (
+        "http://export.arxiv.org/api/query?"
+        + urlencode({
+            "search_query": f"cat:{category}",
+            "sortBy": "submittedDate",
+            "sortOrder": "descending",
+        })
+        + "&start={start}&max_results={max_results}"
+    )
+    for category in CATEGORY_CONFIG
+}
+
 
 @dataclass
 class FetchedPaper:
@@ -90,7 +131,7 @@ class FetchedPaper:
     def to_dict(self) -> dict:
         return asdict(self)
 
-    @property
+    @cached_property
     def summary_text(self) -> str:
         """Text sent to ChromaDB for embedding."""
         authors_str = ", ".join(self.authors[:5])
@@ -129,11 +170,11 @@ def fetch_arxiv_papers(
             continue
 
         try:
-            papers = _query_arxiv(
-                category=category,
-                keywords=config["keywords"],
-                max_results=max_per_category,
-            )
+            keyword_re = _KEYWORD_RE[category]
+            papers = [
+                p for p in _query_arxiv(category=category, max_results=ARXIV_WINDOW)
+                if keyword_re.search(p.title) or keyword_re.search(p.abstract)
+            ][:max_per_category]
 
             for paper in papers:
                 if paper.arxiv_id in seen_ids:
@@ -156,77 +197,82 @@ def fetch_arxiv_papers(
 
 def _query_arxiv(
     category: str,
-    keywords: list[str],
-    max_results: int = 10,
+    max_results: int = ARXIV_WINDOW,
 ) -> list[FetchedPaper]:
-    """Query ArXiv Atom API for a single category with keyword filtering."""
-
-    # Build query: category AND (keyword1 OR keyword2 OR ...)
-    keyword_query = " OR ".join(f'abs:"{kw}"' for kw in keywords[:8])  # API limit
-    query = f"cat:{category} AND ({keyword_query})"
-
-    params = urlencode({
-        "search_query": query,
-        "start": 0,
-        "max_results": max_results,
-        "sortBy": "submittedDate",
-        "sortOrder": "descending",
-    })
-
-    url = f"http://export.arxiv.org/api/query?{params}"
+    """Query ArXiv Atom API for the latest submissions in a single category."""
+    url = _ARXIV_URL_TPL[category].format(start=0, max_results=max_results)
     req = Request(url, headers={"User-Agent": "KnowledgeCurator/1.0"})
 
     with urlopen(req, timeout=30) as response:
-        xml_data = response.read()
+        return _parse_atom_feed(response)
+
+
+_ATOM_ENTRY = "{http://www.w3.org/2005/Atom}entry"
 
-    return _parse_atom_feed(xml_data)
 
+def _parse_atom_feed(stream: BinaryIO) -> list[FetchedPaper]:
+    """Parse an ArXiv Atom XML stream into FetchedPaper objects.
 
-def _parse_atom_feed(xml_data: bytes) -> list[FetchedPaper]:
-    """Parse ArXiv Atom XML into FetchedPaper objects."""
+    Uses iterparse and prunes each <entry> once it has been converted, so
+    neither the raw response bytes nor the full DOM are held in memory.
+    """
     ns = {
         "atom": "http://www.w3.org/2005/Atom",
         "arxiv": "http://arxiv.org/schemas/atom",
     }
 
-    root = ET.fromstring(xml_data)
     papers = []
+    root = None
 
-    for entry in root.findall("atom:entry", ns):
-        title_el = entry.find("atom:title", ns)
-        summary_el = entry.find("atom:summary", ns)
-        published_el = entry.find("atom:published", ns)
-        id_el = entry.find("atom:id", ns)
-
-        if not all([title_el, summary_el, published_el, id_el]):
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        if root is None:
+            root = elem
+        if event != "end" or elem.tag != _ATOM_ENTRY:
             continue
 
-        title = " ".join(title_el.text.strip().split())
-        abstract = " ".join(summary_el.text.strip().split())
-        published = published_el.text.strip()
-        arxiv_url = id_el.text.strip()
-        arxiv_id = arxiv_url.split("/abs/")[-1]
-
-        authors = []
-        for author_el in entry.findall("atom:author", ns):
-            name_el = author_el.find("atom:name", ns)
-            if name_el is not None:
-                authors.append(name_el.text.strip())
-
-        categories = []
-        for cat_el in entry.findall("atom:category", ns):
-            term = cat_el.get("term", "")
-            if term:
-                categories.append(term)
-
-        papers.append(FetchedPaper(
-            arxiv_id=arxiv_id,
-            title=title,
-            abstract=abstract,
-            authors=authors,
-            categories=categories,
-            published=published,
-            url=arxiv_url,
-        ))
+        paper = _parse_atom_entry(elem, ns)
+        if paper is not None:
+            papers.append(paper)
+        elem.clear()
+        root.remove(elem)
 
     return papers
+
+
+def _parse_atom_entry(entry: ET.Element, ns: dict) -> Optional[FetchedPaper]:
+    """Convert a single Atom <entry> element into a FetchedPaper."""
+    title_el = entry.find("atom:title", ns)
+    summary_el = entry.find("atom:summary", ns)
+    published_el = entry.find("atom:published", ns)
+    id_el = entry.find("atom:id", ns)
+
+    if any(el is None for el in (title_el, summary_el, published_el, id_el)):
+        return None
+
+    title = " ".join(title_el.text.strip().split())
+    abstract = " ".join(summary_el.text.strip().split())
+    published = published_el.text.strip()
+    arxiv_url = id_el.text.strip()
+    arxiv_id = arxiv_url.split("/abs/")[-1]
+
+    authors = []
+    for author_el in entry.findall("atom:author", ns):
+        name_el = author_el.find("atom:name", ns)
+        if name_el is not None:
+            authors.append(name_el.text.strip())
+
+    categories = []
+    for cat_el in entry.findall("atom:category", ns):
+        term = cat_el.get("term", "")
+        if term:
+            categories.append(term)
+
+    return FetchedPaper(
+        arxiv_id=arxiv_id,
+        title=title,
+        abstract=abstract,
+        authors=authors,
+        categories=categories,
+        published=published,
+        url=arxiv_url,
+    )
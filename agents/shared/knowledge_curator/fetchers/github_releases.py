@@ -17,14 +17,31 @@ Tracked repos (configurable via config/knowledge_sources.json):
 import os
 import json
 import logging
+import functools
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Iterator, Optional
 from dataclasses import dataclass, field, asdict
 
 from dotenv import load_dotenv
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger("knowledge_curator.fetchers.github")
 
+_DOTENV_LOADED = False
+
+
+def _ensure_env() -> None:
+    """Load config/.env once per process rather than on every fetch."""
+    global _DOTENV_LOADED
+    if not _DOTENV_LOADED:
+        load_dotenv("config/.env")
+        _DOTENV_LOADED = True
+
 # Default repos to monitor — override via config/knowledge_sources.json
 DEFAULT_REPOS = [
     "crewAIInc/crewAI",
@@ -69,7 +86,7 @@ class FetchedRelease:
     def to_dict(self) -> dict:
         return asdict(self)
 
-    @property
+    @functools.cached_property
     def summary_text(self) -> str:
         """Text sent to ChromaDB for embedding."""
         return (
@@ -145,63 +162,93 @@ def fetch_github_releases(
     Uses PyGithub (already in your stack from Phase 6).
     Falls back gracefully if rate-limited or if a repo has no releases.
     """
+    return list(iter_github_releases(repos, since_days, max_per_repo))
+
+
+def iter_github_releases(
+    repos: Optional[list[str]] = None,
+    since_days: int = 7,
+    max_per_repo: int = 3,
+) -> Iterator[FetchedRelease]:
+    """
+    Lazily yield recent releases, one repo at a time.
+
+    Callers that only need the first N entries can itertools.islice()
+    this and skip the GitHub requests for the remaining repos.
+    """
     from github import Github, Auth
 
-    load_dotenv("config/.env")
+    _ensure_env()
     token = os.getenv("GITHUB_TOKEN")
     if not token or token == "your_github_pat_here":
         logger.error("GITHUB_TOKEN not configured in config/.env")
-        return []
+        return
 
     auth = Auth.Token(token)
-    g = Github(auth=auth)
+    g = Github(auth=auth, per_page=max_per_repo)
 
     if repos is None:
         repos = _load_repo_list()
 
     since = datetime.now(tz=timezone.utc) - timedelta(days=since_days)
-    results = []
 
-    for repo_name in repos:
-        try:
-            repo = g.get_repo(repo_name)
-            releases = repo.get_releases()
+    try:
+        for repo_name in repos:
+            try:
+                repo = g.get_repo(repo_name)
+                page = repo.get_releases().get_page(0)[:max_per_repo]
+            except Exception as e:
+                logger.warning(f"  ⚠️ {repo_name}: {e}")
+                continue
 
             count = 0
-            for release in releases:
-                if count >= max_per_repo:
-                    break
-                if release.published_at and release.published_at >= since:
-                    entry = FetchedRelease(
-                        repo=repo_name,
-                        tag=release.tag_name,
-                        title=release.title or release.tag_name,
-                        body=release.body or "",
-                        published_at=release.published_at.isoformat(),
-                        url=release.html_url,
-                        target_agents=REPO_AGENT_MAP.get(repo_name, ["all"]),
-                        tags=REPO_TAG_MAP.get(repo_name, []),
-                    )
-                    results.append(entry)
-                    count += 1
+            for release in page:
+                # Read the list payload directly — attribute access on a
+                # partially-loaded PyGithub object can trigger a lazy GET.
+                raw = release._rawData
+                published = raw.get("published_at")
+                if not published:
+                    continue
+                published_at = datetime.fromisoformat(published.replace("Z", "+00:00"))
+                if published_at < since:
+                    continue
+                count += 1
+                yield FetchedRelease(
+                    repo=repo_name,
+                    tag=raw["tag_name"],
+                    title=raw.get("name") or raw["tag_name"],
+                    body=raw.get("body") or "",
+                    published_at=published_at.isoformat(),
+                    url=raw["html_url"],
+                    target_agents=REPO_AGENT_MAP.get(repo_name, ["all"]),
+                    tags=REPO_TAG_MAP.get(repo_name, []),
+                )
 
             logger.info(f"  ✅ {repo_name}: {count} releases since {since.date()}")
+    finally:
+        g.close()
 
-        except Exception as e:
-            logger.warning(f"  ⚠️ {repo_name}: {e}")
-            continue
 
-    g.close()
-    return results
+_CONFIG_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "config", "knowledge_sources.json"
+)
 
 
 def _load_repo_list() -> list[str]:
-    """Load repo list from config file, fall back to defaults."""
-    config_path = os.path.join(
-        os.path.dirname(__file__), "..", "config", "knowledge_sources.json"
-    )
-    if os.path.exists(config_path):
-        with open(config_path) as f:
-            config = json.load(f)
-        return config.get("github_repos", DEFAULT_REPOS)
-    return DEFAULT_REPOS
+    """Load repo list from config file, fall back to defaults.
+
+    The parsed result is cached and keyed on the file's mtime, so edits to
+    knowledge_sources.json are picked up without re-reading on every call.
+    """
+    try:
+        mtime = os.path.getmtime(_CONFIG_PATH)
+    except OSError:
+        return DEFAULT_REPOS
+    return _load_repo_list_cached(mtime)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_repo_list_cached(mtime: float) -> list[str]:
+    with open(_CONFIG_PATH, "rb") as f:
+        config = _json_loads(f.read())
+    return config.get("github_repos", DEFAULT_REPOS)
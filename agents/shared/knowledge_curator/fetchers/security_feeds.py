@@ -13,13 +13,22 @@ This ensures the Security Reviewer and DevOps agents always have
 current vulnerability context when producing SRR and DIR artifacts.
 """
 
+import re
+import sys
 import json
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass, field, asdict
+from functools import cached_property
 from typing import Optional
 from urllib.request import urlopen, Request
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger("knowledge_curator.fetchers.security")
 
 # ── Stack-relevant keywords for CVE filtering ─────────────────────
@@ -32,6 +41,11 @@ STACK_KEYWORDS = [
     "injection", "authentication", "authorization", "encryption",
     "keychain", "keystore", "certificate", "code signing",
 ]
+STACK_KEYWORDS = tuple(sys.intern(kw.lower()) for kw in STACK_KEYWORDS)
+
+# Single case-insensitive pass over a CVE description — avoids allocating
+# a lowercased copy of every (often multi-KB) NVD description.
+_STACK_RE = re.compile("|".join(map(re.escape, STACK_KEYWORDS)), re.IGNORECASE)
 
 # ── Severity filter ───────────────────────────────────────────────
 SEVERITY_THRESHOLD = ["CRITICAL", "HIGH"]
@@ -57,7 +71,7 @@ class FetchedCVE:
     def to_dict(self) -> dict:
         return asdict(self)
 
-    @property
+    @cached_property
     def summary_text(self) -> str:
         return (
             f"CVE Advisory: {self.cve_id} [{self.severity}] (Score: {self.score})\n"
@@ -84,7 +98,7 @@ class FetchedOWASPUpdate:
     def to_dict(self) -> dict:
         return asdict(self)
 
-    @property
+    @cached_property
     def summary_text(self) -> str:
         return (
             f"OWASP Update: {self.title}\n"
@@ -131,7 +145,7 @@ def fetch_cve_advisories(
                 "Accept": "application/json",
             })
             with urlopen(req, timeout=30) as response:
-                data = json.loads(response.read())
+                data = _json_loads(response.read())
 
             for vuln in data.get("vulnerabilities", []):
                 cve = _parse_nvd_entry(vuln)
@@ -178,8 +192,7 @@ def _parse_nvd_entry(vuln: dict) -> Optional[FetchedCVE]:
             return None
 
         # Check keyword relevance
-        desc_lower = desc.lower()
-        if not any(kw in desc_lower for kw in STACK_KEYWORDS):
+        if not _STACK_RE.search(desc):
             return None
 
         # Get severity from CVSS metrics
@@ -211,6 +224,41 @@ def _parse_nvd_entry(vuln: dict) -> Optional[FetchedCVE]:
         return None
 
 
+# Stable OWASP resources — the evaluator checks these for content changes
+_OWASP_RESOURCES = (
+    (
+        "OWASP Mobile Application Security Testing Guide (MASTG)",
+        (
+            "Comprehensive guide for mobile application security testing. "
+            "Covers iOS and Android security testing methodology, tools, "
+            "and test cases for authentication, data storage, cryptography, "
+            "network communication, and platform interaction."
+        ),
+        "https://mas.owasp.org/MASTG/",
+    ),
+    (
+        "OWASP Mobile Application Security Verification Standard (MASVS)",
+        (
+            "Security standard for mobile applications. Defines security "
+            "requirements organized by: architecture/design, data storage, "
+            "cryptography, authentication, network communication, platform "
+            "interaction, code quality, and resilience."
+        ),
+        "https://mas.owasp.org/MASVS/",
+    ),
+    (
+        "OWASP Top 10 for Web Applications",
+        (
+            "The standard awareness document for web application security. "
+            "Covers: broken access control, cryptographic failures, injection, "
+            "insecure design, security misconfiguration, vulnerable components, "
+            "identification failures, integrity failures, logging failures, SSRF."
+        ),
+        "https://owasp.org/www-project-top-ten/",
+    ),
+)
+
+
 def fetch_owasp_updates() -> list[FetchedOWASPUpdate]:
     """
     Return curated OWASP resource references.
@@ -219,41 +267,8 @@ def fetch_owasp_updates() -> list[FetchedOWASPUpdate]:
     of key resources and their known-good URLs. The evaluator agent
     can check these periodically for updates.
     """
-    # These are stable OWASP resources — the evaluator checks for content changes
-    resources = [
-        FetchedOWASPUpdate(
-            title="OWASP Mobile Application Security Testing Guide (MASTG)",
-            description=(
-                "Comprehensive guide for mobile application security testing. "
-                "Covers iOS and Android security testing methodology, tools, "
-                "and test cases for authentication, data storage, cryptography, "
-                "network communication, and platform interaction."
-            ),
-            url="https://mas.owasp.org/MASTG/",
-            published=datetime.utcnow().isoformat(),
-        ),
-        FetchedOWASPUpdate(
-            title="OWASP Mobile Application Security Verification Standard (MASVS)",
-            description=(
-                "Security standard for mobile applications. Defines security "
-                "requirements organized by: architecture/design, data storage, "
-                "cryptography, authentication, network communication, platform "
-                "interaction, code quality, and resilience."
-            ),
-            url="https://mas.owasp.org/MASVS/",
-            published=datetime.utcnow().isoformat(),
-        ),
-        FetchedOWASPUpdate(
-            title="OWASP Top 10 for Web Applications",
-            description=(
-                "The standard awareness document for web application security. "
-                "Covers: broken access control, cryptographic failures, injection, "
-                "insecure design, security misconfiguration, vulnerable components, "
-                "identification failures, integrity failures, logging failures, SSRF."
-            ),
-            url="https://owasp.org/www-project-top-ten/",
-            published=datetime.utcnow().isoformat(),
-        ),
+    published = datetime.now(timezone.utc).isoformat()
+    return [
+        FetchedOWASPUpdate(title=title, description=description, url=url, published=published)
+        for title, description, url in _OWASP_RESOURCES
     ]
-
-    return resources
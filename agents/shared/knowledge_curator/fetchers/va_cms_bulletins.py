@@ -12,11 +12,11 @@ ensuring agents working on VA/healthcare projects have current
 regulatory and technical context.
 """
 
-import json
 import logging
 import xml.etree.ElementTree as ET
-from datetime import datetime
-from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Optional
 from urllib.request import urlopen, Request
 
@@ -40,9 +40,20 @@ class FetchedBulletin:
     tags: list[str] = field(default_factory=lambda: ["healthcare", "government"])
 
     def to_dict(self) -> dict:
-        return asdict(self)
-
-    @property
+        # Flat record — a literal avoids asdict()'s recursive deep copy
+        return {
+            "title": self.title,
+            "description": self.description,
+            "source": self.source,
+            "url": self.url,
+            "published": self.published,
+            "bulletin_type": self.bulletin_type,
+            "source_type": self.source_type,
+            "target_agents": list(self.target_agents),
+            "tags": list(self.tags),
+        }
+
+    @cached_property
     def summary_text(self) -> str:
         return (
             f"{self.source} Bulletin: {self.title}\n"
@@ -62,6 +73,7 @@ def fetch_va_lighthouse_updates(max_results: int = 10) -> list[FetchedBulletin]:
     application.
     """
     results = []
+    published = datetime.now(timezone.utc).isoformat()
 
     # VA Lighthouse API catalog
     try:
@@ -78,7 +90,7 @@ def fetch_va_lighthouse_updates(max_results: int = 10) -> list[FetchedBulletin]:
             ),
             source="VA",
             url=url,
-            published=datetime.utcnow().isoformat(),
+            published=published,
             bulletin_type="api_update",
             tags=["healthcare", "government", "va", "api", "fhir", "hipaa"],
         )
@@ -99,6 +111,7 @@ def fetch_cms_updates() -> list[FetchedBulletin]:
     maintain references to key standards that affect healthcare
     application development.
     """
+    published = datetime.now(timezone.utc).isoformat()
     standards = [
         FetchedBulletin(
             title="CMS Interoperability and Patient Access Final Rule (CMS-9115-F)",
@@ -110,7 +123,7 @@ def fetch_cms_updates() -> list[FetchedBulletin]:
             ),
             source="CMS",
             url="https://www.cms.gov/priorities/key-initiatives/burden-reduction/interoperability",
-            published=datetime.utcnow().isoformat(),
+            published=published,
             bulletin_type="policy",
             source_type="cms_bulletin",
             tags=["healthcare", "government", "cms", "fhir", "interoperability"],
@@ -126,7 +139,7 @@ def fetch_cms_updates() -> list[FetchedBulletin]:
             ),
             source="CMS",
             url="https://www.healthit.gov/topic/interoperability/policy/trusted-exchange-framework-and-common-agreement-tefca",
-            published=datetime.utcnow().isoformat(),
+            published=published,
             bulletin_type="standard",
             source_type="cms_bulletin",
             tags=["healthcare", "government", "tefca", "interoperability", "hie"],
@@ -143,7 +156,7 @@ def fetch_cms_updates() -> list[FetchedBulletin]:
             ),
             source="CMS",
             url="https://www.hhs.gov/hipaa/for-professionals/security/laws-regulations/index.html",
-            published=datetime.utcnow().isoformat(),
+            published=published,
             bulletin_type="standard",
             source_type="cms_bulletin",
             tags=["healthcare", "hipaa", "security", "phi", "compliance"],
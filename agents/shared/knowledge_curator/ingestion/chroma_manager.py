@@ -19,23 +19,55 @@ Each document stored includes metadata for filtering:
 """
 
 import os
+import json
+import logging
+import time
 import hashlib
+import functools
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 
 import chromadb
+import numpy as np
 import ollama
 from dotenv import load_dotenv
 
+logger = logging.getLogger("knowledge_curator.ingestion")
+
 
 def _get_chroma_path() -> str:
     """Resolve ChromaDB path relative to dev-team root."""
     return os.getenv("CHROMA_PERSIST_DIR", "./memory/chroma_db")
 
 
+_CLIENT: Optional[chromadb.PersistentClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
 def get_client() -> chromadb.PersistentClient:
-    """Return a persistent ChromaDB client."""
-    return chromadb.PersistentClient(path=_get_chroma_path())
+    """
+    Return the process-wide ChromaDB client.
+
+    Embedded (PersistentClient) by default. Set CHROMA_MODE=server to talk
+    to a local Chroma server instead (`chroma run --path $CHROMA_PERSIST_DIR`),
+    which lets parallel agents query without contending on the sqlite
+    file lock. CHROMA_HOST / CHROMA_PORT default to localhost:8000.
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                if os.getenv("CHROMA_MODE", "embedded") == "server":
+                    _CLIENT = chromadb.HttpClient(
+                        host=os.getenv("CHROMA_HOST", "localhost"),
+                        port=int(os.getenv("CHROMA_PORT", "8000")),
+                    )
+                else:
+                    _CLIENT = chromadb.PersistentClient(path=_get_chroma_path())
+    return _CLIENT
 
 
 def get_embed_model() -> str:
@@ -43,54 +75,209 @@ def get_embed_model() -> str:
     return os.getenv("EMBED_MODEL", "nomic-embed-text").replace("ollama/", "")
 
 
-def embed_text(text: str) -> list[float]:
-    """Generate an embedding vector via Ollama."""
-    model = get_embed_model()
+# On-disk query-embedding cache lifetime; 0 disables the disk layer.
+EMBED_CACHE_TTL_DAYS = int(os.getenv("EMBED_CACHE_TTL_DAYS", "7"))
+
+
+def embed_text(text: str) -> np.ndarray:
+    """
+    Generate an embedding vector via Ollama.
+
+    Used for documents being ingested: each chunk is embedded once and its
+    vector lives in Chroma, so nothing is cached. Returned as a read-only
+    float32 array — Chroma accepts ndarrays directly.
+    """
+    response = ollama.embeddings(model=get_embed_model(), prompt=text)
+    return _as_vector(response["embedding"])
+
+
+def embed_query(text: str) -> np.ndarray:
+    """
+    Embed a query string (memoized per model + text).
+
+    Role/task summaries repeat across agent runs, so these go through a
+    process-local LRU and an exact-match disk cache. The cached vector is
+    shared between callers, hence read-only.
+    """
+    return _embed_cached(get_embed_model(), text)
+
+
+def _embed_cache_path(model: str, text: str) -> str:
+    key = hashlib.sha256(f"{model}\0{text}".encode()).hexdigest()
+    return os.path.join(_get_chroma_path(), "embed_cache", key[:2], f"{key}.json")
+
+
+def _as_vector(values: list[float]) -> np.ndarray:
+    vector = np.asarray(values, dtype=np.float32)
+    vector.setflags(write=False)
+    return vector
+
+
+@functools.lru_cache(maxsize=2048)
+def _embed_cached(model: str, text: str) -> np.ndarray:
+    """Process-local LRU in front of an exact-match disk cache and Ollama."""
+    path = _embed_cache_path(model, text) if EMBED_CACHE_TTL_DAYS > 0 else None
+
+    if path:
+        try:
+            if time.time() - os.path.getmtime(path) < EMBED_CACHE_TTL_DAYS * 86400:
+                with open(path) as f:
+                    return _as_vector(json.load(f))
+        except (OSError, ValueError):
+            pass
+
     response = ollama.embeddings(model=model, prompt=text)
-    return response["embedding"]
+    embedding = response["embedding"]
+
+    if path:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(embedding, f)
+        except OSError:
+            pass
+
+    return _as_vector(embedding)
 
 
 def doc_id(source_url: str, chunk_index: int = 0) -> str:
-    """Deterministic document ID from source URL + chunk index."""
+    """
+    Deterministic document ID from source URL + chunk index.
+
+    IDs are persisted in ChromaDB and upserts rely on them to replace
+    re-ingested documents, so the hash must stay SHA-256: switching
+    algorithms would orphan every existing record as a duplicate. The
+    input is a short URL hashed once per document — not a hot path.
+    """
     raw = f"{source_url}::chunk_{chunk_index}"
     return hashlib.sha256(raw.encode()).hexdigest()[:16]
 
 
 # ── Collection Names ──────────────────────────────────────────────
-COLLECTIONS = [
+COLLECTIONS = (
     "dev_practices",
     "ds_methods",
     "domain_healthcare",
     "domain_va",
     "system_updates",
-]
+)
 
 # ── Source → Collection Routing ───────────────────────────────────
+DEFAULT_TARGET_COLLECTIONS = ("system_updates",)
+
 SOURCE_COLLECTION_MAP = {
-    "github_release": ["dev_practices", "system_updates"],
-    "arxiv_paper_cs": ["dev_practices"],
-    "arxiv_paper_stat": ["ds_methods"],
-    "arxiv_paper_cs_ai": ["dev_practices", "ds_methods"],
-    "cve_advisory": ["dev_practices", "system_updates"],
-    "owasp_update": ["dev_practices", "system_updates"],
-    "va_bulletin": ["domain_va", "domain_healthcare"],
-    "cms_bulletin": ["domain_healthcare", "domain_va"],
+    "github_release": ("dev_practices", "system_updates"),
+    "arxiv_paper_cs": ("dev_practices",),
+    "arxiv_paper_stat": ("ds_methods",),
+    "arxiv_paper_cs_ai": ("dev_practices", "ds_methods"),
+    "cve_advisory": ("dev_practices", "system_updates"),
+    "owasp_update": ("dev_practices", "system_updates"),
+    "va_bulletin": ("domain_va", "domain_healthcare"),
+    "cms_bulletin": ("domain_healthcare", "domain_va"),
 }
 
 
-def init_collections(client: Optional[chromadb.PersistentClient] = None) -> dict:
-    """Create or retrieve all five knowledge collections. Returns name→collection map."""
+_COLLECTIONS: Optional[dict] = None
+
+
+# Safer-than-OFF bulk-ingest settings: WAL keeps readers unblocked and
+# durable across crashes; NORMAL sync is safe under WAL.
+BULK_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+def _apply_bulk_pragmas(client) -> bool:
+    """
+    Best-effort sqlite tuning for an ingest window.
+
+    Reaches into the Python sqlite sysdb of the embedded client; Rust-backed
+    and HTTP clients don't expose one, in which case this is a no-op.
+    """
+    try:
+        pool = client._server._sysdb._conn_pool  # chromadb internals
+        conn = pool.connect()
+    except AttributeError:
+        logger.debug("Chroma sqlite connection not reachable — skipping PRAGMAs")
+        return False
+    try:
+        for pragma in BULK_PRAGMAS:
+            conn.execute(pragma)
+    except Exception as e:
+        logger.debug(f"Bulk PRAGMAs not applied: {e}")
+        return False
+    finally:
+        pool.return_to_pool(conn)
+    return True
+
+
+def init_collections(
+    client: Optional[chromadb.PersistentClient] = None,
+    bulk_mode: bool = False,
+) -> dict:
+    """
+    Create or retrieve all five knowledge collections. Returns name→collection map.
+
+    bulk_mode applies ingest-friendly sqlite PRAGMAs first; use it for
+    curator ingest runs, not for query serving.
+    """
+    global _COLLECTIONS
+    if bulk_mode:
+        _apply_bulk_pragmas(client if client is not None else get_client())
+    shared = client is None or client is _CLIENT
+    if shared and _COLLECTIONS is not None:
+        return _COLLECTIONS
     if client is None:
         client = get_client()
-    return {
+    collections = {
         name: client.get_or_create_collection(name=name)
         for name in COLLECTIONS
     }
+    if shared:
+        _COLLECTIONS = collections
+    return collections
 
 
-def ingest_document(
-    collections: dict,
-    text: str,
+# ── Collection count cache ────────────────────────────────────────
+# count() scans collection metadata; RAG lookups only need it to gate
+# empty collections and clamp n_results. Writes in this process
+# invalidate immediately. Known-populated collections stay cached until
+# then; empty ones are re-checked after the TTL so documents ingested by
+# another process (e.g. the curator cron job) are picked up.
+COUNT_CACHE_TTL_SECONDS = 60
+_COUNT_CACHE: dict[str, tuple[int, float]] = {}
+
+
+def collection_count(collection) -> int:
+    """Return collection.count(), memoized per collection name."""
+    cached = _COUNT_CACHE.get(collection.name)
+    if cached and (
+        cached[0] > 0 or time.monotonic() - cached[1] < COUNT_CACHE_TTL_SECONDS
+    ):
+        return cached[0]
+    count = collection.count()
+    _COUNT_CACHE[collection.name] = (count, time.monotonic())
+    return count
+
+
+def invalidate_collection_counts(*names: str) -> None:
+    """Drop cached counts for the given collections (all if none given)."""
+    if not names:
+        _COUNT_CACHE.clear()
+    for name in names:
+        _COUNT_CACHE.pop(name, None)
+
+
+# Chroma's upsert throughput peaks around a few hundred records per call.
+INGEST_BATCH_SIZE = 250
+# Concurrent Ollama embedding requests during bulk ingestion.
+EMBED_WORKERS = int(os.getenv("EMBED_WORKERS", "4"))
+
+
+def _build_metadata(
+    now: datetime,
     source_type: str,
     source_url: str,
     relevance_score: float,
@@ -98,24 +285,14 @@ def ingest_document(
     tags: list[str],
     title: str = "",
     expires_days: Optional[int] = None,
-    chunk_index: int = 0,
 ) -> dict:
-    """
-    Embed and store a document in the appropriate collection(s).
-
-    Returns a summary dict with collection names and doc IDs written.
-    """
-    now = datetime.utcnow()
+    """Metadata record stored alongside each document."""
     expires_at = (
         (now + timedelta(days=expires_days)).isoformat()
         if expires_days
         else ""
     )
-
-    embedding = embed_text(text)
-    did = doc_id(source_url, chunk_index)
-
-    metadata = {
+    return {
         "source_type": source_type,
         "source_url": source_url,
         "title": title,
@@ -126,7 +303,33 @@ def ingest_document(
         "tags": ",".join(tags),
     }
 
-    target_collections = SOURCE_COLLECTION_MAP.get(source_type, ["system_updates"])
+
+def ingest_document(
+    collections: dict,
+    text: str,
+    source_type: str,
+    source_url: str,
+    relevance_score: float,
+    target_agents: list[str],
+    tags: list[str],
+    title: str = "",
+    expires_days: Optional[int] = None,
+    chunk_index: int = 0,
+) -> dict:
+    """
+    Embed and store a document in the appropriate collection(s).
+
+    Returns a summary dict with collection names and doc IDs written.
+    """
+    now = datetime.utcnow()
+    embedding = embed_text(text)
+    did = doc_id(source_url, chunk_index)
+    metadata = _build_metadata(
+        now, source_type, source_url, relevance_score,
+        target_agents, tags, title, expires_days,
+    )
+
+    target_collections = SOURCE_COLLECTION_MAP.get(source_type, DEFAULT_TARGET_COLLECTIONS)
     results = {}
 
     for coll_name in target_collections:
@@ -142,29 +345,108 @@ def ingest_document(
         )
         results[coll_name] = did
 
+    invalidate_collection_counts(*results)
     return results
 
 
+def ingest_documents_bulk(
+    collections: dict,
+    docs: list[dict],
+    batch_size: int = INGEST_BATCH_SIZE,
+) -> list[dict]:
+    """
+    Embed and store many documents with one upsert per collection per batch.
+
+    Each doc dict takes the same keys as ingest_document's parameters
+    (text, source_type, source_url, relevance_score, target_agents, tags,
+    and optionally title, expires_days, chunk_index).
+
+    Returns one {collection: doc_id} summary per input doc, in order.
+    """
+    now = datetime.utcnow()
+    # collection → doc_id → (text, embedding, metadata); keyed by ID so a
+    # repeated source URL within one batch doesn't trip Chroma's
+    # duplicate-ID check — the last occurrence wins, as with sequential
+    # upserts.
+    pending = defaultdict(dict)
+    written = set()
+    summaries = []
+
+    def flush(coll_name: str) -> None:
+        records = pending.pop(coll_name, None)
+        if not records:
+            return
+        ids = list(records)
+        collections[coll_name].upsert(
+            ids=ids,
+            documents=[records[i][0] for i in ids],
+            embeddings=[records[i][1] for i in ids],
+            metadatas=[records[i][2] for i in ids],
+        )
+        written.add(coll_name)
+
+    try:
+        with ThreadPoolExecutor(max_workers=EMBED_WORKERS) as pool:
+            # Embeddings come back in order while later ones are still in
+            # flight, so the upserts below overlap with Ollama round-trips.
+            embeddings = pool.map(embed_text, [doc["text"] for doc in docs])
+
+            for doc, embedding in zip(docs, embeddings):
+                did = doc_id(doc["source_url"], doc.get("chunk_index", 0))
+                metadata = _build_metadata(
+                    now,
+                    doc["source_type"],
+                    doc["source_url"],
+                    doc["relevance_score"],
+                    doc["target_agents"],
+                    doc["tags"],
+                    doc.get("title", ""),
+                    doc.get("expires_days"),
+                )
+
+                summary = {}
+                for coll_name in SOURCE_COLLECTION_MAP.get(doc["source_type"], DEFAULT_TARGET_COLLECTIONS):
+                    if coll_name not in collections:
+                        continue
+                    pending[coll_name][did] = (doc["text"], embedding, metadata)
+                    summary[coll_name] = did
+                    if len(pending[coll_name]) >= batch_size:
+                        flush(coll_name)
+                summaries.append(summary)
+    finally:
+        # An embedding failure mustn't discard the documents already
+        # embedded; per-document upserts would have kept them too
+        for coll_name in list(pending):
+            flush(coll_name)
+        invalidate_collection_counts(*written)
+
+    return summaries
+
+
 def query_collection(
     collection_name: str,
     query_text: str,
     n_results: int = 5,
     where_filter: Optional[dict] = None,
     client: Optional[chromadb.PersistentClient] = None,
+    query_embedding: Optional[np.ndarray] = None,
 ) -> dict:
     """
     Query a knowledge collection by semantic similarity.
 
     This is the function the Orchestrator will call before each agent task
-    to inject relevant knowledge into the agent's context.
+    to inject relevant knowledge into the agent's context. Pass
+    query_embedding when querying several collections with the same text
+    to skip re-embedding it for each one.
     """
     if client is None:
         client = get_client()
     collection = client.get_or_create_collection(name=collection_name)
-    embedding = embed_text(query_text)
+    if query_embedding is None:
+        query_embedding = embed_query(query_text)
 
     kwargs = {
-        "query_embeddings": [embedding],
+        "query_embeddings": [query_embedding],
         "n_results": n_results,
     }
     if where_filter:
@@ -187,18 +469,25 @@ def purge_expired(client: Optional[chromadb.PersistentClient] = None) -> dict:
 
     for name in COLLECTIONS:
         coll = client.get_or_create_collection(name=name)
-        # Get all docs with an expiration set
-        all_docs = coll.get(where={"expires_at": {"$ne": ""}})
+        # Get all docs with an expiration set. Chroma's $lt only accepts
+        # numeric operands, so the ISO-string comparison stays client-side —
+        # but only metadata is needed, not the document bodies.
+        all_docs = coll.get(
+            where={"expires_at": {"$ne": ""}},
+            include=["metadatas"],
+        )
 
         expired_ids = []
         if all_docs and all_docs["ids"]:
-            for i, doc_id_val in enumerate(all_docs["ids"]):
-                meta = all_docs["metadatas"][i]
-                if meta.get("expires_at") and meta["expires_at"] < now:
-                    expired_ids.append(doc_id_val)
+            expired_ids = [
+                doc_id_val
+                for doc_id_val, meta in zip(all_docs["ids"], all_docs["metadatas"])
+                if meta.get("expires_at") and meta["expires_at"] < now
+            ]
 
         if expired_ids:
             coll.delete(ids=expired_ids)
+            invalidate_collection_counts(name)
         removed[name] = len(expired_ids)
 
     return removed
@@ -35,60 +35,98 @@ The function is designed to be:
 """
 
 import os
+import re
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 from dotenv import load_dotenv
 
 logger = logging.getLogger("knowledge_curator.rag_inject")
 
+_DOTENV_LOADED = False
+
+
+def _ensure_env() -> None:
+    """Load config/.env once per process rather than on every lookup."""
+    global _DOTENV_LOADED
+    if not _DOTENV_LOADED:
+        load_dotenv("config/.env")
+        _DOTENV_LOADED = True
+
 # ── Agent Role → Collection Mapping ──────────────────────────────
 # Determines which collections each agent queries.
-# Agents not listed here get ["dev_practices", "system_updates"] by default.
+# Agents not listed here get DEFAULT_COLLECTIONS.
+
+DEFAULT_COLLECTIONS = ("dev_practices", "system_updates")
 
 AGENT_COLLECTION_MAP = {
     # Strategy layer
-    "Product Manager": ["dev_practices", "domain_va", "domain_healthcare"],
-    "Business Analyst": ["dev_practices", "domain_va", "domain_healthcare"],
-    "Scrum Master": ["dev_practices"],
-    "Technical Architect": ["dev_practices", "system_updates"],
-    "Security Reviewer": ["dev_practices", "system_updates", "domain_healthcare"],
-    "UX/UI Designer": ["dev_practices", "domain_healthcare"],
-    "UX Content Guide": ["dev_practices", "domain_healthcare"],
+    "Product Manager": ("dev_practices", "domain_va", "domain_healthcare"),
+    "Business Analyst": ("dev_practices", "domain_va", "domain_healthcare"),
+    "Scrum Master": ("dev_practices",),
+    "Technical Architect": ("dev_practices", "system_updates"),
+    "Security Reviewer": ("dev_practices", "system_updates", "domain_healthcare"),
+    "UX/UI Designer": ("dev_practices", "domain_healthcare"),
+    "UX Content Guide": ("dev_practices", "domain_healthcare"),
 
     # Build layer
-    "Senior Developer": ["dev_practices", "system_updates"],
-    "Backend Developer": ["dev_practices", "system_updates"],
-    "Frontend Developer": ["dev_practices", "system_updates"],
-    "Database Administrator": ["dev_practices", "system_updates"],
-    "DevOps Engineer": ["dev_practices", "system_updates"],
+    "Senior Developer": ("dev_practices", "system_updates"),
+    "Backend Developer": ("dev_practices", "system_updates"),
+    "Frontend Developer": ("dev_practices", "system_updates"),
+    "Database Administrator": ("dev_practices", "system_updates"),
+    "DevOps Engineer": ("dev_practices", "system_updates"),
 
     # Quality layer
-    "QA Lead": ["dev_practices", "system_updates"],
-    "Test Automation Engineer": ["dev_practices", "system_updates"],
+    "QA Lead": ("dev_practices", "system_updates"),
+    "Test Automation Engineer": ("dev_practices", "system_updates"),
 
     # Mobile layer
-    "Mobile UX Designer": ["dev_practices", "domain_healthcare"],
-    "iOS Developer": ["dev_practices", "system_updates"],
-    "Android Developer": ["dev_practices", "system_updates"],
-    "RN Architect": ["dev_practices", "system_updates"],
-    "RN Developer": ["dev_practices", "system_updates"],
-    "Mobile DevOps": ["dev_practices", "system_updates"],
-    "Mobile QA": ["dev_practices", "system_updates"],
+    "Mobile UX Designer": ("dev_practices", "domain_healthcare"),
+    "iOS Developer": ("dev_practices", "system_updates"),
+    "Android Developer": ("dev_practices", "system_updates"),
+    "RN Architect": ("dev_practices", "system_updates"),
+    "RN Developer": ("dev_practices", "system_updates"),
+    "Mobile DevOps": ("dev_practices", "system_updates"),
+    "Mobile QA": ("dev_practices", "system_updates"),
 
     # DS layer
-    "Data Strategist": ["ds_methods", "domain_va", "domain_healthcare"],
-    "Domain Analyst": ["domain_va", "domain_healthcare"],
-    "Data Engineer": ["ds_methods", "dev_practices"],
-    "Statistical Modeler": ["ds_methods"],
-    "ML Engineer": ["ds_methods", "dev_practices"],
-    "Simulation Engineer": ["ds_methods"],
+    "Data Strategist": ("ds_methods", "domain_va", "domain_healthcare"),
+    "Domain Analyst": ("domain_va", "domain_healthcare"),
+    "Data Engineer": ("ds_methods", "dev_practices"),
+    "Statistical Modeler": ("ds_methods",),
+    "ML Engineer": ("ds_methods", "dev_practices"),
+    "Simulation Engineer": ("ds_methods",),
 
     # Orchestration
-    "Orchestrator": ["system_updates", "dev_practices", "ds_methods"],
-    "Dev-Team Orchestrator": ["system_updates", "dev_practices"],
+    "Orchestrator": ("system_updates", "dev_practices", "ds_methods"),
+    "Dev-Team Orchestrator": ("system_updates", "dev_practices"),
 }
 
+# ── Query preparation ─────────────────────────────────────────────
+QUERY_MAX_CHARS = 500
+_QUERY_BOILERPLATE_RE = re.compile(r"\btask for:\s*", re.IGNORECASE)
+
+
+def _prep_query(text: str) -> str:
+    """
+    Normalize a task summary for embedding.
+
+    Drops inject_for_agent's "task for:" boilerplate, collapses whitespace
+    (spec excerpts are often indented blocks), and truncates on a word
+    boundary so the query never ends in a half word.
+    """
+    text = " ".join(_QUERY_BOILERPLATE_RE.sub("", text).split())
+    if len(text) <= QUERY_MAX_CHARS:
+        return text
+    cut = text.rfind(" ", 0, QUERY_MAX_CHARS + 1)
+    return text[:cut if cut > 0 else QUERY_MAX_CHARS]
+
+
+# Whether this Chroma build accepts $contains in metadata where-filters.
+# None until the first filtered query settles it.
+_WHERE_CONTAINS_SUPPORTED: Optional[bool] = None
+
 
 def get_knowledge_context(
     agent_role: str,
@@ -113,72 +151,78 @@ def get_knowledge_context(
         Formatted string of relevant knowledge, or empty string if none found.
     """
     try:
-        load_dotenv("config/.env")
+        _ensure_env()
 
         # Import here to avoid circular deps and allow graceful failure
         from agents.shared.knowledge_curator.ingestion.chroma_manager import (
             get_client,
-            embed_text,
+            embed_query,
+            collection_count,
+            init_collections,
         )
 
         client = get_client()
+        # Reuse the cached handles for the standard knowledge collections
+        handles = init_collections()
 
         # Determine which collections to query
         if collections is None:
-            collections = AGENT_COLLECTION_MAP.get(
-                agent_role, ["dev_practices", "system_updates"]
-            )
-
-        all_results = []
+            collections = AGENT_COLLECTION_MAP.get(agent_role, DEFAULT_COLLECTIONS)
 
+        # Skip empty collections before paying for the embedding
+        targets = []
         for coll_name in collections:
             try:
-                collection = client.get_or_create_collection(name=coll_name)
-
-                if collection.count() == 0:
-                    continue
-
-                # Build query
-                query_embedding = embed_text(task_summary[:500])
-
-                kwargs = {
-                    "query_embeddings": [query_embedding],
-                    "n_results": min(n_results, collection.count()),
-                }
-
-                # Optionally filter by agent role
-                if filter_by_agent:
-                    kwargs["where"] = {
-                        "$or": [
-                            {"target_agents": {"$contains": agent_role}},
-                            {"target_agents": {"$contains": "all"}},
-                        ]
-                    }
-
-                try:
-                    results = collection.query(**kwargs)
-                except Exception:
-                    # Fall back without filter if metadata filtering fails
-                    kwargs.pop("where", None)
-                    results = collection.query(**kwargs)
-
-                if results and results["documents"] and results["documents"][0]:
-                    for i, doc in enumerate(results["documents"][0]):
-                        metadata = {}
-                        if results["metadatas"] and results["metadatas"][0]:
-                            metadata = results["metadatas"][0][i]
-
-                        all_results.append({
-                            "collection": coll_name,
-                            "title": metadata.get("title", ""),
-                            "source_type": metadata.get("source_type", ""),
-                            "score": metadata.get("relevance_score", 0),
-                            "text": doc[:max_chars_per_result],
-                        })
-
+                collection = handles.get(coll_name)
+                if collection is None:
+                    collection = client.get_or_create_collection(name=coll_name)
+                count = collection_count(collection)
             except Exception as e:
                 logger.debug(f"  Collection {coll_name} query failed: {e}")
                 continue
+            if count:
+                targets.append((coll_name, collection, count))
+
+        if not targets:
+            return ""
+
+        # Same query for every collection — embed once
+        query_embedding = embed_query(_prep_query(task_summary))
+
+        # Optionally filter by agent role
+        where = None
+        if filter_by_agent:
+            where = {
+                "$or": [
+                    {"target_agents": {"$contains": agent_role}},
+                    {"target_agents": {"$contains": "all"}},
+                ]
+            }
+
+        def query_one(target: tuple) -> list[dict]:
+            coll_name, collection, count = target
+            return _query_collection(
+                coll_name, collection, query_embedding,
+                min(n_results, count), where, max_chars_per_result,
+            )
+
+        # Collection lookups are independent — overlap them
+        if len(targets) == 1:
+            per_collection = [query_one(targets[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+                per_collection = list(pool.map(query_one, targets))
+
+        # Collections overlap (e.g. a CVE lands in dev_practices and
+        # system_updates) — keep the first hit per title
+        all_results = []
+        seen_titles = set()
+        for hits in per_collection:
+            for hit in hits:
+                if hit["title"] in seen_titles:
+                    continue
+                seen_titles.add(hit["title"])
+                all_results.append(hit)
 
         if not all_results:
             return ""
@@ -194,6 +238,61 @@ def get_knowledge_context(
         return ""
 
 
+def _query_collection(
+    coll_name: str,
+    collection,
+    query_embedding,
+    n_results: int,
+    where: Optional[dict],
+    max_chars_per_result: int,
+) -> list[dict]:
+    """Run one collection query and flatten the hits. Never raises."""
+    try:
+        global _WHERE_CONTAINS_SUPPORTED
+
+        kwargs = {
+            "query_embeddings": [query_embedding],
+            "n_results": n_results,
+        }
+        if where and _WHERE_CONTAINS_SUPPORTED is not False:
+            kwargs["where"] = where
+
+        try:
+            results = collection.query(**kwargs)
+            if "where" in kwargs:
+                _WHERE_CONTAINS_SUPPORTED = True
+        except Exception as e:
+            if "where" not in kwargs:
+                raise
+            # Fall back without filter if metadata filtering fails. A
+            # ValueError is Chroma rejecting the $contains filter itself —
+            # remember that so later lookups skip the doomed attempt.
+            if isinstance(e, ValueError):
+                _WHERE_CONTAINS_SUPPORTED = False
+            kwargs.pop("where", None)
+            results = collection.query(**kwargs)
+
+        hits = []
+        if results and results["documents"] and results["documents"][0]:
+            for i, doc in enumerate(results["documents"][0]):
+                metadata = {}
+                if results["metadatas"] and results["metadatas"][0]:
+                    metadata = results["metadatas"][0][i]
+
+                hits.append({
+                    "collection": coll_name,
+                    "title": metadata.get("title", ""),
+                    "source_type": metadata.get("source_type", ""),
+                    "score": metadata.get("relevance_score", 0),
+                    "text": doc[:max_chars_per_result],
+                })
+        return hits
+
+    except Exception as e:
+        logger.debug(f"  Collection {coll_name} query failed: {e}")
+        return []
+
+
 def _format_results(results: list[dict]) -> str:
     """Format query results into a clean context block for the agent."""
     if not results:
@@ -202,13 +301,8 @@ def _format_results(results: list[dict]) -> str:
     lines = []
     lines.append("─" * 50)
 
-    seen_titles = set()
     for r in results:
         title = r.get("title", "")
-        if title in seen_titles:
-            continue
-        seen_titles.add(title)
-
         source_label = _source_label(r.get("source_type", ""))
         lines.append(f"[{source_label}] {title}")
         lines.append(r["text"])
@@ -15,6 +15,7 @@ import sys
 sys.path.insert(0, "/home/mfelkey/dev-team")
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 load_dotenv("config/.env")
@@ -25,12 +26,14 @@ from agents.shared.knowledge_curator.rag_inject import (
 )
 
 
-def test_agent(role: str, task: str):
-    """Test RAG injection for a single agent role."""
-    print(f"\n{'='*60}")
-    print(f"🧪 Testing: {role}")
-    print(f"   Task: {task[:80]}")
-    print(f"{'='*60}")
+def test_agent(role: str, task: str) -> str:
+    """Test RAG injection for a single agent role. Returns the report text."""
+    lines = [
+        f"\n{'='*60}",
+        f"🧪 Testing: {role}",
+        f"   Task: {task[:80]}",
+        f"{'='*60}",
+    ]
 
     result = get_knowledge_context(
         agent_role=role,
@@ -43,52 +46,44 @@ def test_agent(role: str, task: str):
         preview = result[:500]
         if len(result) > 500:
             preview += f"\n... ({len(result)} chars total)"
-        print(preview)
+        lines.append(preview)
     else:
-        print("  (no results — collection may be empty for this role)")
+        lines.append("  (no results — collection may be empty for this role)")
 
+    return "\n".join(lines)
 
-def main():
-    print("🧠 RAG Injection Test Suite")
-    print("=" * 60)
 
-    # Test dev agents against dev_practices + system_updates
-    test_agent(
-        "Backend Developer",
-        "Build REST API endpoints for project data with authentication"
-    )
+CASES = [
+    # Dev agents against dev_practices + system_updates
+    ("Backend Developer",
+     "Build REST API endpoints for project data with authentication"),
+    ("Security Reviewer",
+     "Review architecture for PHI data handling and HIPAA compliance"),
+    ("DevOps Engineer",
+     "Set up Docker Compose deployment with CI/CD pipeline"),
 
-    test_agent(
-        "Security Reviewer",
-        "Review architecture for PHI data handling and HIPAA compliance"
-    )
+    # Mobile agents
+    ("RN Developer",
+     "Implement React Native screens for trip tracking with Expo"),
+    ("Mobile DevOps",
+     "Configure EAS Build and Fastlane for app store deployment"),
 
-    test_agent(
-        "DevOps Engineer",
-        "Set up Docker Compose deployment with CI/CD pipeline"
-    )
+    # Domain-specific agents against VA/healthcare collections
+    ("Product Manager",
+     "Define requirements for the project scheduling system"),
+    ("Business Analyst",
+     "Map stakeholders and process flows for the project domain"),
+]
 
-    # Test mobile agents
-    test_agent(
-        "RN Developer",
-        "Implement React Native screens for trip tracking with Expo"
-    )
-
-    test_agent(
-        "Mobile DevOps",
-        "Configure EAS Build and Fastlane for app store deployment"
-    )
 
-    # Test domain-specific agents against VA/healthcare collections
-    test_agent(
-        "Product Manager",
-        "Define requirements for the project scheduling system"
-    )
+def main():
+    print("🧠 RAG Injection Test Suite")
+    print("=" * 60)
 
-    test_agent(
-        "Business Analyst",
-        "Map stakeholders and process flows for the project domain"
-    )
+    # Lookups are independent — run them concurrently, print in order
+    with ThreadPoolExecutor(max_workers=len(CASES)) as pool:
+        for report in pool.map(lambda case: test_agent(*case), CASES):
+            print(report)
 
     # Test the convenience wrapper
     print(f"\n{'='*60}")
@@ -30,181 +30,124 @@ import os
 import re
 import sys
 import glob
+import bisect
 import shutil
+import tempfile
 from datetime import datetime
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
 # ═══════════════════════════════════════════════════════════════════
 #  AGENT REGISTRY — maps file paths to CONTEXT_MAP agent IDs
 #  and the artifact types each agent consumes
 # ═══════════════════════════════════════════════════════════════════
 
+# types_str / context_block are derived from the other fields once at import
+# (see the loop below the registry), not per migrated file
+AgentInfo = namedtuple(
+    "AgentInfo",
+    ["agent_id", "consumes", "produces", "types_str", "context_block"],
+    defaults=("", ""),
+)
+
 AGENT_REGISTRY = {
     # ── Planning ─────────────────────────────────────────────────
-    "dev/strategy/business_analyst.py": {
-        "agent_id": "biz_analyst",
-        "consumes": ["PRD"],
-        "produces": "BAD",
-    },
-    "dev/strategy/scrum_master.py": {
-        "agent_id": "scrum_master",
-        "consumes": ["PRD", "BAD"],
-        "produces": "SPRINT_PLAN",
-    },
-    "dev/strategy/technical_architect.py": {
-        "agent_id": "architect",
-        "consumes": ["PRD", "BAD", "SPRINT_PLAN"],
-        "produces": "TAD",
-    },
-    "dev/strategy/security_reviewer.py": {
-        "agent_id": "security",
-        "consumes": ["PRD", "TAD"],
-        "produces": "SRR",
-    },
-    "dev/strategy/ux_designer.py": {
-        "agent_id": "ux_designer",
-        "consumes": ["PRD", "BAD", "SRR"],
-        "produces": "UXD",
-    },
-    "dev/strategy/ux_content_guide.py": {
-        "agent_id": "ux_content",
-        "consumes": ["PRD", "UXD"],
-        "produces": "CONTENT_GUIDE",
-    },
+    "dev/strategy/business_analyst.py": AgentInfo("biz_analyst", ("PRD",), "BAD"),
+    "dev/strategy/scrum_master.py": AgentInfo(
+        "scrum_master", ("PRD", "BAD"), "SPRINT_PLAN"),
+    "dev/strategy/technical_architect.py": AgentInfo(
+        "architect", ("PRD", "BAD", "SPRINT_PLAN"), "TAD"),
+    "dev/strategy/security_reviewer.py": AgentInfo("security", ("PRD", "TAD"), "SRR"),
+    "dev/strategy/ux_designer.py": AgentInfo("ux_designer", ("PRD", "BAD", "SRR"), "UXD"),
+    "dev/strategy/ux_content_guide.py": AgentInfo(
+        "ux_content", ("PRD", "UXD"), "CONTENT_GUIDE"),
 
     # ── Test Spec ────────────────────────────────────────────────
-    "dev/build/senior_developer.py": {
-        "agent_id": "senior_dev",
-        "consumes": ["PRD", "TAD", "UXD"],
-        "produces": "TIP",
-    },
-    "dev/performance/performance_planner.py": {
-        "agent_id": "perf_plan",
-        "consumes": ["PRD", "TAD", "TIP"],
-        "produces": "PBD",
-    },
-    "dev/quality/qa_lead.py": {
-        "agent_id": "qa_lead",
-        "consumes": ["PRD", "TIP", "TAD", "UXD"],
-        "produces": "MTP",
-    },
-    "dev/quality/test_automation_engineer.py": {
-        "agent_id": "test_auto",
-        "consumes": ["MTP", "TIP", "TAD"],
-        "produces": "TAR",
-    },
+    "dev/build/senior_developer.py": AgentInfo(
+        "senior_dev", ("PRD", "TAD", "UXD"), "TIP"),
+    "dev/performance/performance_planner.py": AgentInfo(
+        "perf_plan", ("PRD", "TAD", "TIP"), "PBD"),
+    "dev/quality/qa_lead.py": AgentInfo("qa_lead", ("PRD", "TIP", "TAD", "UXD"), "MTP"),
+    "dev/quality/test_automation_engineer.py": AgentInfo(
+        "test_auto", ("MTP", "TIP", "TAD"), "TAR"),
 
     # ── Build ────────────────────────────────────────────────────
-    "dev/build/backend_developer.py": {
-        "agent_id": "backend_dev",
-        "consumes": ["TIP", "TAD", "MTP", "TAR"],
-        "produces": "BIR",
-    },
-    "dev/build/frontend_developer.py": {
-        "agent_id": "frontend_dev",
-        "consumes": ["TIP", "UXD", "MTP", "TAR", "CONTENT_GUIDE", "BIR"],
-        "produces": "FIR",
-    },
-    "dev/build/database_admin.py": {
-        "agent_id": "dba",
-        "consumes": ["BIR", "TAD", "SRR"],
-        "produces": "DBAR",
-    },
-    "desktop/desktop_developer.py": {
-        "agent_id": "desktop_dev",
-        "consumes": ["UXD", "TAD", "TIP", "BIR", "FIR"],
-        "produces": "DSKR",
-    },
-    "dev/build/devops_engineer.py": {
-        "agent_id": "devops",
-        "consumes": ["TIP", "TAD", "SRR", "TAR"],
-        "produces": "DIR",
-    },
-    "docs/devex_writer.py": {
-        "agent_id": "devex_writer",
-        "consumes": ["PRD", "TAD", "BIR", "FIR", "DIR", "DSKR"],
-        "produces": "DXR",
-    },
+    "dev/build/backend_developer.py": AgentInfo(
+        "backend_dev", ("TIP", "TAD", "MTP", "TAR"), "BIR"),
+    "dev/build/frontend_developer.py": AgentInfo(
+        "frontend_dev", ("TIP", "UXD", "MTP", "TAR", "CONTENT_GUIDE", "BIR"), "FIR"),
+    "dev/build/database_admin.py": AgentInfo("dba", ("BIR", "TAD", "SRR"), "DBAR"),
+    "desktop/desktop_developer.py": AgentInfo(
+        "desktop_dev", ("UXD", "TAD", "TIP", "BIR", "FIR"), "DSKR"),
+    "dev/build/devops_engineer.py": AgentInfo(
+        "devops", ("TIP", "TAD", "SRR", "TAR"), "DIR"),
+    "docs/devex_writer.py": AgentInfo(
+        "devex_writer", ("PRD", "TAD", "BIR", "FIR", "DIR", "DSKR"), "DXR"),
 
     # ── Verify ───────────────────────────────────────────────────
-    "dev/security/penetration_tester.py": {
-        "agent_id": "pen_test",
-        "consumes": ["SRR", "BIR", "FIR", "DIR", "DBAR"],
-        "produces": "PTR",
-    },
-    "dev/scalability/scalability_architect.py": {
-        "agent_id": "scale_arch",
-        "consumes": ["TAD", "BIR", "FIR", "DBAR", "DIR"],
-        "produces": "SAR",
-    },
-    "dev/performance/performance_auditor.py": {
-        "agent_id": "perf_audit",
-        "consumes": ["PBD", "BIR", "FIR", "DIR", "DBAR", "DSKR"],
-        "produces": "PAR",
-    },
-    "dev/accessibility/accessibility_specialist.py": {
-        "agent_id": "a11y_audit",
-        "consumes": ["UXD", "FIR", "BIR", "IIR", "AIR", "RN_GUIDE", "DSKR"],
-        "produces": "AAR",
-    },
-    "compliance/license_scanner.py": {
-        "agent_id": "license_scan",
-        "consumes": ["PRD", "BIR", "FIR", "DIR", "DSKR", "IIR", "AIR", "RN_GUIDE"],
-        "produces": "LCR",
-    },
-    "dev/quality/test_verify.py": {
-        "agent_id": "verify",
-        "consumes": ["TAR", "BIR", "FIR", "DIR"],
-        "produces": "VERIFY",
-    },
+    "dev/security/penetration_tester.py": AgentInfo(
+        "pen_test", ("SRR", "BIR", "FIR", "DIR", "DBAR"), "PTR"),
+    "dev/scalability/scalability_architect.py": AgentInfo(
+        "scale_arch", ("TAD", "BIR", "FIR", "DBAR", "DIR"), "SAR"),
+    "dev/performance/performance_auditor.py": AgentInfo(
+        "perf_audit", ("PBD", "BIR", "FIR", "DIR", "DBAR", "DSKR"), "PAR"),
+    "dev/accessibility/accessibility_specialist.py": AgentInfo(
+        "a11y_audit", ("UXD", "FIR", "BIR", "IIR", "AIR", "RN_GUIDE", "DSKR"), "AAR"),
+    "compliance/license_scanner.py": AgentInfo(
+        "license_scan", ("PRD", "BIR", "FIR", "DIR", "DSKR", "IIR", "AIR", "RN_GUIDE"), "LCR"),
+    "dev/quality/test_verify.py": AgentInfo(
+        "verify", ("TAR", "BIR", "FIR", "DIR"), "VERIFY"),
 
     # ── Mobile ───────────────────────────────────────────────────
-    "mobile/qa/mobile_qa_specialist.py": {
-        "agent_id": "mobile_qa",
-        "consumes": ["MUXD", "PRD", "TAD"],
-        "produces": "MOBILE_TEST_PLAN",
-    },
-    "mobile/ios/ios_developer.py": {
-        "agent_id": "ios_dev",
-        "consumes": ["MUXD", "PRD", "MOBILE_TEST_PLAN"],
-        "produces": "IIR",
-    },
-    "mobile/android/android_developer.py": {
-        "agent_id": "android_dev",
-        "consumes": ["MUXD", "PRD", "MOBILE_TEST_PLAN"],
-        "produces": "AIR",
-    },
-    "mobile/rn/react_native_architect_part1.py": {
-        "agent_id": "rn_arch_p1",
-        "consumes": ["MUXD", "MOBILE_TEST_PLAN"],
-        "produces": "RNAD_P1",
-    },
-    "mobile/rn/react_native_developer.py": {
-        "agent_id": "rn_dev",
-        "consumes": ["RNAD_P1", "RNAD_P2", "MOBILE_TEST_PLAN"],
-        "produces": "RN_GUIDE",
-    },
-    "mobile/devops/mobile_devops_engineer.py": {
-        "agent_id": "mobile_devops",
-        "consumes": ["RN_GUIDE", "SRR", "MOBILE_TEST_PLAN"],
-        "produces": "MDIR",
-    },
-    "mobile/security/mobile_penetration_tester.py": {
-        "agent_id": "mobile_pen_test",
-        "consumes": ["SRR", "IIR", "AIR", "RN_GUIDE", "MDIR"],
-        "produces": "MOBILE_PTR",
-    },
-    "mobile/scalability/mobile_scalability_review.py": {
-        "agent_id": "mobile_scale",
-        "consumes": ["MUXD", "IIR", "AIR", "RN_GUIDE", "MDIR"],
-        "produces": "MOBILE_SAR",
-    },
-    "mobile/quality/mobile_test_verify.py": {
-        "agent_id": "mobile_verify",
-        "consumes": ["MOBILE_TEST_PLAN", "IIR", "AIR", "RN_GUIDE", "MDIR"],
-        "produces": "MOBILE_VERIFY",
-    },
+    "mobile/qa/mobile_qa_specialist.py": AgentInfo(
+        "mobile_qa", ("MUXD", "PRD", "TAD"), "MOBILE_TEST_PLAN"),
+    "mobile/ios/ios_developer.py": AgentInfo(
+        "ios_dev", ("MUXD", "PRD", "MOBILE_TEST_PLAN"), "IIR"),
+    "mobile/android/android_developer.py": AgentInfo(
+        "android_dev", ("MUXD", "PRD", "MOBILE_TEST_PLAN"), "AIR"),
+    "mobile/rn/react_native_architect_part1.py": AgentInfo(
+        "rn_arch_p1", ("MUXD", "MOBILE_TEST_PLAN"), "RNAD_P1"),
+    "mobile/rn/react_native_developer.py": AgentInfo(
+        "rn_dev", ("RNAD_P1", "RNAD_P2", "MOBILE_TEST_PLAN"), "RN_GUIDE"),
+    "mobile/devops/mobile_devops_engineer.py": AgentInfo(
+        "mobile_devops", ("RN_GUIDE", "SRR", "MOBILE_TEST_PLAN"), "MDIR"),
+    "mobile/security/mobile_penetration_tester.py": AgentInfo(
+        "mobile_pen_test", ("SRR", "IIR", "AIR", "RN_GUIDE", "MDIR"), "MOBILE_PTR"),
+    "mobile/scalability/mobile_scalability_review.py": AgentInfo(
+        "mobile_scale", ("MUXD", "IIR", "AIR", "RN_GUIDE", "MDIR"), "MOBILE_SAR"),
+    "mobile/quality/mobile_test_verify.py": AgentInfo(
+        "mobile_verify", ("MOBILE_TEST_PLAN", "IIR", "AIR", "RN_GUIDE", "MDIR"), "MOBILE_VERIFY"),
 }
 
+
+def _build_context_block(agent_id, types_str):
+    return (
+        f'    # ── Smart extraction: load relevant sections for {agent_id} ──\n'
+        f'    ctx = load_agent_context(\n'
+        f'        context=context,\n'
+        f'        consumer="{agent_id}",\n'
+        f'        artifact_types=[{types_str}],\n'
+        f'        max_chars_per_artifact=6000\n'
+        f'    )\n'
+        f'    prompt_context = format_context_for_prompt(ctx)\n'
+    )
+
+
+for _rel_path, _info in AGENT_REGISTRY.items():
+    _types_str = ", ".join(f'"{t}"' for t in _info.consumes)
+    AGENT_REGISTRY[_rel_path] = _info._replace(
+        types_str=_types_str,
+        context_block=_build_context_block(_info.agent_id, _types_str),
+    )
+del _rel_path, _info, _types_str
+
+UPSTREAM_CONTEXT_BLOCK = "=== UPSTREAM CONTEXT ===\n{prompt_context}"
+
+SMART_IMPORT_LINE = (
+    "from agents.orchestrator.context_manager import "
+    "load_agent_context, format_context_for_prompt, on_artifact_saved"
+)
+
 # ═══════════════════════════════════════════════════════════════════
 #  DETECTION — find f.read()[:N] patterns
 # ═══════════════════════════════════════════════════════════════════
@@ -218,36 +161,94 @@ READ_PATTERN = re.compile(
     re.MULTILINE
 )
 
-# Pattern: matches the full open-read block:
+# Pattern: either the full open-read block
 #   var = ""
 #   if path and os.path.exists(path):
 #       with open(path) as f:
 #           var = f.read()[:N]
-OPEN_READ_BLOCK = re.compile(
-    r'(\s+)(\w+)\s*=\s*""\s*\n'
-    r'\s+if\s+(\w+)\s+and\s+os\.path\.exists\(\3\):\s*\n'
-    r'\s+with\s+open\(\3\)\s+as\s+f:\s*\n'
-    r'\s+\2\s*=\s*f\.read\(\)\[:(\d+)\]',
+# or a simple 2-line open-read. One alternation walks the text once; the
+# 4-line form is tried first so a simple read inside it is never matched
+# separately.
+READ_BLOCK_RE = re.compile(
+    r'(?P<open>'
+    r'\s+(?P<o_var>\w+)\s*=\s*""\s*\n'
+    r'\s+if\s+(?P<o_path>\w+)\s+and\s+os\.path\.exists\((?P=o_path)\):\s*\n'
+    r'\s+with\s+open\((?P=o_path)\)\s+as\s+f:\s*\n'
+    r'\s+(?P=o_var)\s*=\s*f\.read\(\)\[:(?P<o_chars>\d+)\]'
+    r')|(?P<simple>'
+    r'\s+with\s+open\((?P<s_path>\w+)\)\s+as\s+f:\s*\n'
+    r'\s+(?P<s_var>\w+)\s*=\s*f\.read\(\)\[:(?P<s_chars>\d+)\]'
+    r')',
     re.MULTILINE
 )
 
-# Pattern: simple 2-line open-read
-SIMPLE_READ_BLOCK = re.compile(
-    r'(\s+)with\s+open\((\w+)\)\s+as\s+f:\s*\n'
-    r'\s+(\w+)\s*=\s*f\.read\(\)\[:(\d+)\]',
-    re.MULTILINE
-)
+# Files migrated concurrently by main()
+MIGRATE_WORKERS = 8
 
 # Import already present?
 SMART_IMPORT = "from agents.orchestrator.context_manager import"
 
+# Top-level import lines (insertion point for the smart_extract import)
+IMPORT_LINE_RE = re.compile(r'^(?:from|import)\s+.+$', re.MULTILINE)
+
+# context["artifacts"].append(...) call and the path variable inside it
+ARTIFACT_APPEND_RE = re.compile(
+    r'(    context\["artifacts"\]\.append\(.+?\))\s*\n',
+    re.DOTALL
+)
+PATH_KEY_RE = re.compile(r'"path":\s*(\w+)')
+
+# Runs of 4+ newlines left behind by removals
+BLANK_RUN_RE = re.compile(r'\n{4,}')
+
+
+def _var_alternation(var_names):
+    return "(?P<var>" + "|".join(re.escape(v) for v in var_names) + ")"
+
+
+def _header_vars_re(var_names):
+    """Pattern: === SOME HEADER ===\n{var_name} for any of var_names"""
+    # Header text is case-insensitive; the variable name is not
+    return re.compile(
+        r'(===\s*[^=]+===\s*\n)\s*\{(?-i:' + _var_alternation(var_names) + r')\}',
+        re.IGNORECASE
+    )
+
+
+def _bare_vars_line_re(var_names):
+    """Pattern: a line holding nothing but {var_name} (conditional blocks, etc.)"""
+    return re.compile(
+        r'^[ \t]*\{' + _var_alternation(var_names) + r'\}[ \t]*$',
+        re.MULTILINE
+    )
+
+
+def _first_match_per_var(pattern, content, is_free):
+    """One finditer pass; keep each var's first match that passes is_free."""
+    matches = {}
+    for m in pattern.finditer(content):
+        var = m.group("var")
+        if var not in matches and is_free(m):
+            matches[var] = m
+    return matches
+
 
 def find_agent_files(base_dir):
     """Find all agent Python files that might need migration."""
+    # One walk of agents/ instead of an exists() probe per registry entry
+    agents_dir = os.path.join(base_dir, "agents")
+    index = {}
+    for root, _, files in os.walk(agents_dir):
+        for name in files:
+            if name.endswith(".py"):
+                full_path = os.path.join(root, name)
+                rel = os.path.relpath(full_path, agents_dir).replace(os.sep, "/")
+                index[rel] = full_path
+
     results = []
     for rel_path, info in AGENT_REGISTRY.items():
-        full_path = os.path.join(base_dir, "agents", rel_path)
-        if os.path.exists(full_path):
+        full_path = index.get(rel_path)
+        if full_path:
             results.append((full_path, rel_path, info))
         else:
             # Try alternate paths
@@ -257,238 +258,239 @@ def find_agent_files(base_dir):
     return results
 
 
+def _is_already_migrated(filepath):
+    """Stream the file and stop at the first smart_extract import line."""
+    with open(filepath) as f:
+        return any(SMART_IMPORT in line for line in f)
+
+
 def analyze_file(filepath):
     """Analyze a file for f.read()[:N] patterns. Returns list of findings."""
     with open(filepath) as f:
         content = f.read()
 
+    # Cheap substring gate: most files never contain a truncated read
+    if "f.read()[:" not in content:
+        return [], SMART_IMPORT in content, content
+
     findings = []
 
-    # Check for 4-line open-read blocks
-    for m in OPEN_READ_BLOCK.finditer(content):
+    for m in READ_BLOCK_RE.finditer(content):
+        if m.lastgroup == "open":
+            finding_type, var, path_var, chars = (
+                "open_read_block", m.group("o_var"), m.group("o_path"), m.group("o_chars"))
+        else:
+            finding_type, var, path_var, chars = (
+                "simple_read", m.group("s_var"), m.group("s_path"), m.group("s_chars"))
         findings.append({
-            "type": "open_read_block",
-            "var": m.group(2),
-            "path_var": m.group(3),
-            "chars": int(m.group(4)),
+            "type": finding_type,
+            "var": var,
+            "path_var": path_var,
+            "chars": int(chars),
             "match": m.group(0),
             "start": m.start(),
             "end": m.end(),
         })
 
-    # Check for 2-line simple reads (only if not already caught above)
-    for m in SIMPLE_READ_BLOCK.finditer(content):
-        # Skip if this span overlaps with an already-found block
-        overlaps = any(f["start"] <= m.start() <= f["end"] for f in findings)
-        if not overlaps:
-            findings.append({
-                "type": "simple_read",
-                "var": m.group(3),
-                "path_var": m.group(2),
-                "chars": int(m.group(4)),
-                "match": m.group(0),
-                "start": m.start(),
-                "end": m.end(),
-            })
-
     already_migrated = SMART_IMPORT in content
     return findings, already_migrated, content
 
 
 def generate_replacement(agent_info, findings):
     """Generate the smart extraction replacement code."""
-    agent_id = agent_info["agent_id"]
-    consumes = agent_info["consumes"]
-    produces = agent_info["produces"]
-
-    # Build the import line
-    import_line = (
-        "from agents.orchestrator.context_manager import "
-        "load_agent_context, format_context_for_prompt, on_artifact_saved"
-    )
-
-    # Build the context loading block
-    types_str = ", ".join(f'"{t}"' for t in consumes)
-    context_block = (
-        f'    # ── Smart extraction: load relevant sections for {agent_id} ──\n'
-        f'    ctx = load_agent_context(\n'
-        f'        context=context,\n'
-        f'        consumer="{agent_id}",\n'
-        f'        artifact_types=[{types_str}],\n'
-        f'        max_chars_per_artifact=6000\n'
-        f'    )\n'
-        f'    prompt_context = format_context_for_prompt(ctx)\n'
-    )
-
     # Build the on_artifact_saved call
     save_hook = (
-        f'    on_artifact_saved(context, "{produces}", '
+        f'    on_artifact_saved(context, "{agent_info.produces}", '
     )
 
-    return import_line, context_block, save_hook
+    return SMART_IMPORT_LINE, agent_info.context_block, save_hook
 
 
 def apply_migration(filepath, agent_info, dry_run=False):
     """Apply the smart extraction migration to a single file."""
-    findings, already_migrated, content = analyze_file(filepath)
-
-    if already_migrated:
+    if _is_already_migrated(filepath):
         return "SKIP", "Already migrated (has smart_extract import)"
 
+    findings, _, content = analyze_file(filepath)
+
     if not findings:
         return "SKIP", "No f.read()[:N] patterns found"
 
-    agent_id = agent_info["agent_id"]
+    agent_id = agent_info.agent_id
     import_line, context_block, save_hook = generate_replacement(agent_info, findings)
 
-    new_content = content
+    # Every rewrite is recorded as a (start, end, replacement) edit against
+    # the ORIGINAL content and applied in one linear join at the end, rather
+    # than re-slicing the whole file for each change.
+    edits = []
+    # Sorted, disjoint (start, end) spans of the non-empty edits, so overlap
+    # tests are a binary search instead of a scan over every edit
+    span_starts = []
+    span_ends = []
+
+    def _add_edit(start, end, replacement):
+        edits.append((start, end, replacement))
+        if end > start:
+            idx = bisect.bisect_left(span_starts, start)
+            span_starts.insert(idx, start)
+            span_ends.insert(idx, end)
+
+    def _overlaps_edit(start, end):
+        idx = bisect.bisect_left(span_starts, end) - 1
+        return idx >= 0 and span_ends[idx] > start
 
     # 1. Add import after existing imports
     # Find the last 'from ... import' or 'import ...' line
     import_insertion_point = 0
-    for m in re.finditer(r'^(?:from|import)\s+.+$', new_content, re.MULTILINE):
+    for m in IMPORT_LINE_RE.finditer(content):
         candidate = m.end()
         # Don't insert after the line if it's inside a try/except
-        line_start = new_content.rfind('\n', 0, m.start()) + 1
         indent = len(m.group(0)) - len(m.group(0).lstrip())
         if indent == 0:
             import_insertion_point = candidate
 
     if import_insertion_point > 0:
-        new_content = (
-            new_content[:import_insertion_point] +
-            f"\n{import_line}\n" +
-            new_content[import_insertion_point:]
-        )
+        _add_edit(import_insertion_point, import_insertion_point, f"\n{import_line}\n")
 
     # 2. Replace all f.read()[:N] blocks with the smart extraction block
-    # We need to rebuild the findings positions since we modified content
     # Strategy: replace ALL read blocks with a single context_block
     # placed where the FIRST read block was
 
     # Find all variable names that were being read
     var_names = [f["var"] for f in findings]
 
-    # Find the first read block in the NEW content
-    first_block = None
-    last_block = None
-    for pattern in [OPEN_READ_BLOCK, SIMPLE_READ_BLOCK]:
-        for m in pattern.finditer(new_content):
-            if first_block is None or m.start() < first_block.start():
-                first_block = m
-            if last_block is None or m.end() > last_block.end():
-                last_block = m
-
-    if first_block and last_block:
-        # Get the region from first to last read block
-        region_start = first_block.start()
-        region_end = last_block.end()
-
-        # Check if there's non-read code between blocks that we should preserve
-        region_text = new_content[region_start:region_end]
-
-        # Replace the entire region with the context block
-        new_content = (
-            new_content[:region_start] +
-            "\n" + context_block + "\n" +
-            new_content[region_end:]
-        )
+    # Replace the region from the first to the last read block
+    # (findings are in text order) with the context block
+    _add_edit(findings[0]["start"], findings[-1]["end"], "\n" + context_block + "\n")
+    # The block ends in a blank line; blank lines already following the
+    # region would stack onto it
+    did_remove = content.startswith("\n\n", findings[-1]["end"])
 
     # 3. Replace variable references in the Task description
     # Find all === HEADER === + {var} blocks and replace with one {prompt_context}
     # Strategy: find the first {old_var}, replace with {prompt_context},
     # remove all subsequent {old_var} references and their headers
+    #
+    # All vars are matched in one pass per pattern (header+var, then
+    # standalone lines for vars without a header) instead of one regex
+    # walk per var.
+    def _is_free(m):
+        return not _overlaps_edit(m.start(), m.end())
+
+    referenced = [v for v in dict.fromkeys(var_names) if '{' + v + '}' in content]
+    header_matches = {}
+    bare_matches = {}
+    if referenced:
+        header_matches = _first_match_per_var(
+            _header_vars_re(referenced), content, _is_free)
+        headerless = [v for v in referenced if v not in header_matches]
+        if headerless:
+            bare_matches = _first_match_per_var(
+                _bare_vars_line_re(headerless), content, _is_free)
+
     first_replaced = False
     for var in var_names:
-        # Pattern: === SOME HEADER ===\n{var_name}
-        header_var_pattern = re.compile(
-            r'(===\s*[^=]+===\s*\n)\s*\{' + re.escape(var) + r'\}',
-            re.IGNORECASE
-        )
-        # Pattern: just {var_name} on its own line (conditional blocks, etc.)
-        bare_var_pattern = re.compile(
-            r'\{' + re.escape(var) + r'\}',
-        )
-
-        if not first_replaced:
-            # Replace the first header+var block with {prompt_context}
-            m = header_var_pattern.search(new_content)
-            if m:
-                new_content = (
-                    new_content[:m.start()] +
-                    "=== UPSTREAM CONTEXT ===\n{prompt_context}" +
-                    new_content[m.end():]
-                )
+        # A header+var block is replaced (first one) or removed (the rest);
+        # otherwise fall through to the standalone-line removal
+        m = header_matches.pop(var, None)
+        if m:
+            if first_replaced:
+                _add_edit(m.start(), m.end(), "")
+                did_remove = True
+            else:
+                _add_edit(m.start(), m.end(), UPSTREAM_CONTEXT_BLOCK)
                 first_replaced = True
-                continue
+            continue
 
-        # For all subsequent vars, remove the header+var or just the var
-        m = header_var_pattern.search(new_content)
+        # Bare var (e.g., conditional f-string blocks): if a line is JUST
+        # the variable reference, remove the whole line
+        m = bare_matches.pop(var, None)
         if m:
-            new_content = new_content[:m.start()] + new_content[m.end():]
-        else:
-            # Try bare var replacement (e.g., conditional f-string blocks)
-            m = bare_var_pattern.search(new_content)
-            if m:
-                # Check if it's in a line by itself or part of conditional
-                line_start = new_content.rfind('\n', 0, m.start())
-                line_end = new_content.find('\n', m.end())
-                line = new_content[line_start:line_end] if line_end > 0 else new_content[line_start:]
-                # If the line is JUST the variable reference, remove the whole line
-                if line.strip() == '{' + var + '}':
-                    new_content = new_content[:line_start] + new_content[line_end:]
-
-    # Clean up any double-blank-line runs created by removals
-    new_content = re.sub(r'\n{4,}', '\n\n\n', new_content)
+            line_start = max(m.start() - 1, 0)
+            if not _overlaps_edit(line_start, m.end()):
+                _add_edit(line_start, m.end(), "")
+                did_remove = True
 
     # 4. Add on_artifact_saved after the artifact write
-    produces = agent_info["produces"]
+    produces = agent_info.produces
     # Find the pattern: context["artifacts"].append(
-    artifact_append = re.search(
-        r'(    context\["artifacts"\]\.append\(.+?\))\s*\n',
-        new_content,
-        re.DOTALL
-    )
+    artifact_append = None
+    if 'context["artifacts"].append(' in content:
+        artifact_append = ARTIFACT_APPEND_RE.search(content)
     if artifact_append:
         # Find the variable name used for the output path
-        path_pattern = re.search(
-            r'"path":\s*(\w+)',
-            artifact_append.group(0)
-        )
+        path_pattern = PATH_KEY_RE.search(artifact_append.group(0))
         if path_pattern:
             path_var = path_pattern.group(1)
             insert_after = artifact_append.end()
             hook_line = f'    on_artifact_saved(context, "{produces}", {path_var})\n'
-            if hook_line.strip() not in new_content:
-                new_content = (
-                    new_content[:insert_after] +
-                    hook_line +
-                    new_content[insert_after:]
-                )
+            if hook_line.strip() not in content and not _overlaps_edit(insert_after, insert_after):
+                _add_edit(insert_after, insert_after, hook_line)
+
+    # Apply all edits in a single pass
+    edits.sort(key=lambda e: (e[0], e[1]))
+    out = []
+    cur = 0
+    for start, end, replacement in edits:
+        out.append(content[cur:start])
+        out.append(replacement)
+        cur = end
+    out.append(content[cur:])
+
+    new_content = "".join(out)
+
+    # Clean up any double-blank-line runs created by removals
+    if did_remove:
+        new_content = BLANK_RUN_RE.sub('\n\n\n', new_content)
+
+    # Nothing to back up or write if the rewrite was a no-op
+    if new_content == content:
+        return "SKIP", "No changes needed"
 
     if dry_run:
         return "WOULD_MIGRATE", f"{len(findings)} read blocks → smart extraction"
 
-    # Backup original
-    backup_path = filepath + ".bak"
-    shutil.copy2(filepath, backup_path)
-
-    # Write migrated file
-    with open(filepath, "w") as f:
+    # Write migrated file to a temp file next to the original
+    with tempfile.NamedTemporaryFile(
+        "w", dir=os.path.dirname(filepath), suffix=".tmp", delete=False
+    ) as f:
         f.write(new_content)
+        tmp_path = f.name
+    shutil.copymode(filepath, tmp_path)
+
+    # Backup original as a hardlink (no bytes copied); the rename below gives
+    # filepath a new inode, so the link keeps the pre-migration content
+    backup_path = filepath + ".bak"
+    try:
+        os.link(filepath, backup_path)
+    except OSError:
+        shutil.copy2(filepath, backup_path)
+    os.replace(tmp_path, filepath)
 
     return "MIGRATED", f"{len(findings)} read blocks → smart extraction (backup: {backup_path})"
 
 
 def revert_migration(base_dir):
     """Revert all migrations from .bak files."""
+    # One walk collects the backups that exist, instead of an exists()
+    # probe per registry entry
+    agents_dir = os.path.join(base_dir, "agents")
+    backups = {}
+    for root, _, files in os.walk(agents_dir):
+        for name in files:
+            if name.endswith(".py.bak"):
+                backup = os.path.join(root, name)
+                rel = os.path.relpath(backup[:-len(".bak")], agents_dir)
+                backups[rel.replace(os.sep, "/")] = backup
+
     count = 0
     for rel_path in AGENT_REGISTRY:
-        full_path = os.path.join(base_dir, "agents", rel_path)
-        backup = full_path + ".bak"
-        if os.path.exists(backup):
-            shutil.copy2(backup, full_path)
-            os.remove(backup)
+        backup = backups.get(rel_path)
+        if backup:
+            full_path = backup[:-len(".bak")]
+            # Rename instead of copy+delete: the .bak already carries the
+            # original bytes and metadata, so nothing needs re-reading
+            os.replace(backup, full_path)
             count += 1
             print(f"  ↩️  Reverted: {rel_path}")
     return count
@@ -507,11 +509,11 @@ def generate_manual_patch(filepath, rel_path, agent_info):
     if already_migrated or not findings:
         return None
 
-    agent_id = agent_info["agent_id"]
-    consumes = agent_info["consumes"]
-    produces = agent_info["produces"]
+    agent_id = agent_info.agent_id
+    consumes = agent_info.consumes
+    produces = agent_info.produces
 
-    types_str = ", ".join(f'"{t}"' for t in consumes)
+    types_str = agent_info.types_str
 
     patch = f"""# ═══════════════════════════════════════════════════════════
 # MANUAL MIGRATION: {rel_path}
@@ -627,15 +629,21 @@ def main():
         print(f"\n✅ Generated {count} patch files in {patch_dir}")
         return
 
-    for full_path, rel_path, info in agents_found:
+    def _migrate(found):
+        full_path, rel_path, info = found
         try:
-            status, message = apply_migration(full_path, info, dry_run=dry_run)
+            return apply_migration(full_path, info, dry_run=dry_run)
+        except Exception as e:
+            return "ERROR", str(e)
+
+    # Files are independent, so migrate them concurrently; map() keeps
+    # the report in registry order
+    icon = {"MIGRATED": "✅", "WOULD_MIGRATE": "🔍", "SKIP": "⏭️ ", "ERROR": "❌"}
+    with ThreadPoolExecutor(max_workers=MIGRATE_WORKERS) as pool:
+        for (_, rel_path, _), (status, message) in zip(
+                agents_found, pool.map(_migrate, agents_found)):
             results[status].append((rel_path, message))
-            icon = {"MIGRATED": "✅", "WOULD_MIGRATE": "🔍", "SKIP": "⏭️ ", "ERROR": "❌"}
             print(f"  {icon.get(status, '?')} {rel_path}: {message}")
-        except Exception as e:
-            results["ERROR"].append((rel_path, str(e)))
-            print(f"  ❌ {rel_path}: {e}")
 
     # Not-found agents
     found_paths = {r for _, r, _ in agents_found}
@@ -19,12 +19,19 @@ import os
 import re
 import hashlib
 import json
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from collections import namedtuple
 from typing import Optional
+from urllib.error import HTTPError
+from urllib.request import urlopen, Request
 
 # ── Optional ChromaDB import ──────────────────────────────────────
 try:
     import chromadb
-    from chromadb.utils import embedding_functions
+    from chromadb.api.types import EmbeddingFunction
     CHROMA_AVAILABLE = True
 except ImportError:
     CHROMA_AVAILABLE = False
@@ -34,6 +41,9 @@ except ImportError:
 #  SECTION EXTRACTION (Tier 1 — Primary)
 # ══════════════════════════════════════════════════════════════════
 
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.+)$")
+_CLEAN_PREFIX_RE = re.compile(r"^[\d\.\-\)\s]+")
+
 def parse_sections(text: str) -> dict:
     """
     Parse a markdown document into a dict of {heading: content}.
@@ -54,39 +64,45 @@ def parse_sections(text: str) -> dict:
     "api endpoints" returns the parent heading's content plus all
     subsections (GET /api/trips, POST /api/trips, etc.).
     """
-    lines = text.split("\n")
-    heading_re = re.compile(r"^(#{1,6})\s+(.+)$")
+    # No '#' anywhere means no headings; skip the line-by-line pass
+    if "#" not in text:
+        return {}
 
-    # First pass: identify all headings with their line numbers and levels
+    # First pass: identify all headings with their levels and character
+    # offsets (start of the heading line, start of the line after it), so
+    # section bodies can be sliced straight out of text
     headings = []
-    for i, line in enumerate(lines):
-        m = heading_re.match(line.strip())
+    pos = 0
+    for line in text.split("\n"):
+        m = _HEADING_RE.match(line.strip())
         if m:
             level = len(m.group(1))
             raw_heading = m.group(2).strip()
-            headings.append((i, level, raw_heading))
+            headings.append((pos, pos + len(line) + 1, level, raw_heading))
+        pos += len(line) + 1
 
     if not headings:
         return {}
 
-    sections = {}
+    # Find where each section ends: at the next heading of equal or higher
+    # (lower number) level. One right-to-left pass tracking the nearest
+    # following heading offset per level instead of a forward scan per heading.
+    ends = [0] * len(headings)
+    next_at_level = [len(text)] * 7
+    for idx in range(len(headings) - 1, -1, -1):
+        line_start, _, level, _ = headings[idx]
+        ends[idx] = min(next_at_level[1:level + 1])
+        next_at_level[level] = line_start
 
-    for idx, (line_num, level, raw_heading) in enumerate(headings):
-        # Find where this section ends:
-        # At the next heading of equal or higher (lower number) level
-        end_line = len(lines)
-        for next_idx in range(idx + 1, len(headings)):
-            next_line, next_level, _ = headings[next_idx]
-            if next_level <= level:
-                end_line = next_line
-                break
+    sections = {}
 
+    for idx, (_, body_start, level, raw_heading) in enumerate(headings):
         # Content from this heading to its end (includes children)
-        content = "\n".join(lines[line_num + 1:end_line]).strip()
+        content = text[body_start:ends[idx]].strip()
 
         # Generate lookup keys
         normalized = raw_heading.lower()
-        cleaned = re.sub(r"^[\d\.\-\)\s]+", "", normalized).strip()
+        cleaned = _CLEAN_PREFIX_RE.sub("", normalized).strip()
 
         if content:
             sections[normalized] = content
@@ -96,7 +112,34 @@ def parse_sections(text: str) -> dict:
     return sections
 
 
-def find_section(sections: dict, wanted: str) -> Optional[str]:
+def build_section_index(sections: dict) -> dict:
+    """
+    Precompute word lookups for find_section's word-overlap step.
+
+    Returns {"words": {word: [keys...]}, "key_words": {key: frozenset},
+    "key_word_counts": {key: int}, "order": {key: position},
+    "items": [(key, content), ...]} so a lookup
+    only scores keys that share at least one word with the wanted name,
+    instead of every key, and the substring steps reuse one items list.
+    """
+    words = {}
+    key_words = {}
+    key_word_counts = {}
+    order = {}
+    for pos, key in enumerate(sections):
+        kw = frozenset(key.split())
+        key_words[key] = kw
+        key_word_counts[key] = len(kw)
+        order[key] = pos
+        for word in kw:
+            words.setdefault(word, []).append(key)
+    return {"words": words, "key_words": key_words,
+            "key_word_counts": key_word_counts, "order": order,
+            "items": list(sections.items())}
+
+
+def find_section(sections: dict, wanted: str,
+                 index: dict = None) -> Optional[str]:
     """
     Find a section by flexible matching.
 
@@ -105,36 +148,66 @@ def find_section(sections: dict, wanted: str) -> Optional[str]:
       2. Substring match (wanted appears in key)
       3. Key appears in wanted
       4. Word overlap scoring (best match with >50% overlap)
+
+    Pass the build_section_index() result for the same sections dict to
+    avoid rescoring every key in step 4.
+    """
+    _, wanted_lower, wanted_words, _ = _normalize_wanted(wanted)
+    return _find_normalized(sections, wanted_lower, wanted_words, index)
+
+
+def _normalize_wanted(wanted: str) -> tuple:
+    """
+    (raw, lowercased/stripped, word set, extract header) — what
+    find_section matches on, plus the separator extract_sections emits.
     """
     wanted_lower = wanted.lower().strip()
-    wanted_words = set(wanted_lower.split())
+    return (wanted, wanted_lower, frozenset(wanted_lower.split()),
+            f"\n--- {wanted.upper()} ---\n")
 
-    # 1. Exact
-    if wanted_lower in sections:
-        return sections[wanted_lower]
 
-    # 2. Substring: wanted in key
-    for key, content in sections.items():
+def _find_normalized(sections: dict, wanted_lower: str, wanted_words: frozenset,
+                     index: dict = None) -> Optional[str]:
+    """find_section() for a wanted name already run through _normalize_wanted."""
+    # 1. Exact
+    content = sections.get(wanted_lower)
+    if content is not None:
+        return content
+
+    # 2. Substring: wanted in key, else
+    # 3. Substring: key in wanted (first such key, found in the same pass)
+    items = index["items"] if index is not None else sections.items()
+    key_in_wanted = None
+    for key, content in items:
         if wanted_lower in key:
             return content
+        if key_in_wanted is None and key in wanted_lower:
+            key_in_wanted = content
+    if key_in_wanted is not None:
+        return key_in_wanted
 
-    # 3. Substring: key in wanted
-    for key, content in sections.items():
-        if key in wanted_lower:
-            return content
-
-    # 4. Word overlap
+    # 4. Word overlap — only keys sharing a word can score above zero
+    if not wanted_words:
+        return None
+    if index is None:
+        index = build_section_index(sections)
+    words = index["words"]
+    candidates = set()
+    for word in wanted_words:
+        candidates.update(words.get(word, ()))
+
+    key_words = index["key_words"]
+    key_word_counts = index["key_word_counts"]
+    n_wanted = len(wanted_words)
     best_score = 0.0
     best_content = None
-    for key, content in sections.items():
-        key_words = set(key.split())
-        if not key_words or not wanted_words:
-            continue
-        overlap = len(wanted_words & key_words)
-        score = overlap / max(len(wanted_words), len(key_words))
+    # Section order decides ties, as in a full scan
+    for key in sorted(candidates, key=index["order"].__getitem__):
+        overlap = len(wanted_words & key_words[key])
+        score = overlap / max(n_wanted, key_word_counts[key])
         if score > best_score and score > 0.5:
             best_score = score
-            best_content = content
+            best_content = sections[key]
 
     return best_content
 
@@ -152,23 +225,63 @@ def extract_sections(text: str, wanted_sections: list, max_chars: int = 0) -> st
         Concatenated content of matching sections, separated by headers.
     """
     sections = parse_sections(text)
+    return _extract_from_parsed(sections, build_section_index(sections),
+                                [_normalize_wanted(w) for w in wanted_sections],
+                                max_chars)
+
+
+def _extract_from_parsed(sections: dict, index: dict, wanted_norm: list,
+                         max_chars: int = 0) -> str:
+    """
+    extract_sections() on an already-parsed sections dict and its index,
+    with wanted names pre-normalized by _normalize_wanted.
+    """
+    # Header and content are appended as separate parts (with the "\n"
+    # between sections added explicitly) so each section's content is
+    # copied once, by the final join
     parts = []
     total = 0
 
-    for wanted in wanted_sections:
-        content = find_section(sections, wanted)
+    for _, wanted_lower, wanted_words, header in wanted_norm:
+        # Fast path: most wanted names are exact heading keys
+        content = sections.get(wanted_lower)
+        if content is None:
+            content = _find_normalized(sections, wanted_lower, wanted_words, index)
         if content:
-            header = f"\n--- {wanted.upper()} ---\n"
-            chunk = header + content
-            if max_chars and total + len(chunk) > max_chars:
+            chunk_len = len(header) + len(content)
+            if max_chars and total + chunk_len > max_chars:
                 remaining = max_chars - total
                 if remaining > 200:  # worth including a truncated section
-                    parts.append(chunk[:remaining] + "\n[...truncated]")
+                    if parts:
+                        parts.append("\n")
+                    parts.append(header[:remaining])
+                    parts.append(content[:max(remaining - len(header), 0)])
+                    parts.append("\n[...truncated]")
                 break
-            parts.append(chunk)
-            total += len(chunk)
+            if parts:
+                parts.append("\n")
+            parts.append(header)
+            parts.append(content)
+            total += chunk_len
+
+    return "".join(parts)
 
-    return "\n".join(parts)
+
+@lru_cache(maxsize=128)
+def _load_artifact(filepath: str, mtime_ns: int, size: int) -> tuple:
+    """
+    Read and parse an artifact once per (path, mtime, size).
+
+    Artifacts are consumed by many agents, so the same file would
+    otherwise be re-read and re-parsed for every consumer. A changed
+    file gets a new cache key, so there's no explicit invalidation.
+    Returns (text, sections, section_index); callers must treat the
+    cached dicts as read-only.
+    """
+    with open(filepath) as f:
+        text = f.read()
+    sections = parse_sections(text)
+    return text, sections, build_section_index(sections)
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -452,6 +565,28 @@ CONTEXT_MAP = {
     },
 }
 
+# CONTEXT_MAP is static, so everything get_context derives from a
+# (consumer, artifact_type) entry is built once here: the normalized
+# wanted names/headers and the Tier-2 query text.
+ExtractionPlan = namedtuple("ExtractionPlan", ["wanted", "wanted_norm", "query_text"])
+
+
+def _semantic_query_text(queries: list) -> str:
+    """Build a natural language query from section names."""
+    return f"Sections about: {', '.join(queries[:5])}"
+
+
+_PLANS = {
+    (consumer, atype): ExtractionPlan(
+        wanted=wanted,
+        wanted_norm=tuple(_normalize_wanted(w) for w in wanted),
+        query_text=_semantic_query_text(wanted),
+    )
+    for consumer, amap in CONTEXT_MAP.items()
+    for atype, wanted in amap.items()
+    if wanted
+}
+
 
 # ══════════════════════════════════════════════════════════════════
 #  CHROMADB SEMANTIC SEARCH (Tier 2 — Fallback)
@@ -460,26 +595,133 @@ CONTEXT_MAP = {
 CHROMA_DIR = os.path.expanduser("~/dev-team/data/chromadb")
 COLLECTION_NAME = "artifact_chunks"
 
+_PARA_SPLIT_RE = re.compile(r"\n\n+")
+
+
+EMBED_FALLBACK_WORKERS = 8
+
+# HNSW settings are fixed when the collection is first created; an
+# existing index keeps the parameters it was built with
+COLLECTION_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 16,
+    "hnsw:construction_ef": 100,
+    "hnsw:search_ef": 50,
+}
+
+
+def get_artifact_embed_model() -> str:
+    """
+    Embedding model for artifact chunks.
+
+    ARTIFACT_EMBED_MODEL, then EMBED_MODEL (shared with the knowledge
+    curator), then nomic-embed-text. A smaller model such as
+    bge-small-en-v1.5 halves vector size, but its dimension differs, so
+    switching models means deleting and re-indexing the collection.
+
+    index_artifact skips unchanged files using _index_manifest.json in
+    CHROMA_DIR. The manifest records the embed model, collection name and
+    collection id it was built against and is ignored when any of them
+    changes, so switching models or re-creating the collection re-indexes
+    every artifact on its next save. Deleting the manifest forces the same.
+    """
+    model = os.getenv("ARTIFACT_EMBED_MODEL") or os.getenv("EMBED_MODEL", "nomic-embed-text")
+    return model.replace("ollama/", "")
+
+# Tier 2 needs ChromaDB installed and an index on disk. Once the directory
+# exists it stays enabled; without ChromaDB the check is a single flag test.
+_TIER2_ENABLED = CHROMA_AVAILABLE and os.path.isdir(CHROMA_DIR)
+
+
+def _tier2_enabled() -> bool:
+    global _TIER2_ENABLED
+    if not _TIER2_ENABLED and CHROMA_AVAILABLE:
+        _TIER2_ENABLED = os.path.isdir(CHROMA_DIR)
+    return _TIER2_ENABLED
+
+
+if CHROMA_AVAILABLE:
+    class OllamaBatchEmbeddingFunction(EmbeddingFunction):
+        """
+        Ollama embeddings with one HTTP round-trip per batch.
+
+        Posts every document to /api/embed in a single request. Ollama
+        builds without that endpoint (404) fall back to the per-text
+        /api/embeddings endpoint, issued concurrently since each call
+        just waits on HTTP. /api/embed returns unit-length vectors and
+        the legacy endpoint doesn't, which only matters for non-cosine
+        spaces; the artifact collection is cosine.
+        """
+
+        def __init__(self, base_url: str, model_name: str, timeout: int = 120):
+            self.base_url = base_url.rstrip("/")
+            self.model_name = model_name
+            self.timeout = timeout
+
+        def _post(self, path: str, payload: dict) -> dict:
+            req = Request(
+                self.base_url + path,
+                data=json.dumps(payload).encode(),
+                headers={"Content-Type": "application/json"},
+            )
+            with urlopen(req, timeout=self.timeout) as response:
+                return json.loads(response.read())
+
+        def _embed_one(self, text: str) -> list:
+            payload = {"model": self.model_name, "prompt": text}
+            return self._post("/api/embeddings", payload)["embedding"]
+
+        def __call__(self, input):
+            texts = list(input)
+            if not texts:
+                return []
+            try:
+                payload = {"model": self.model_name, "input": texts}
+                return self._post("/api/embed", payload)["embeddings"]
+            except HTTPError as e:
+                if e.code != 404:
+                    raise
+            workers = min(EMBED_FALLBACK_WORKERS, len(texts))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(self._embed_one, texts))
+
+
+# Process-wide collection handle; the client, embedding function and
+# collection lookup are built once, not per index/search call
+_COLLECTION = None
+_COLLECTION_LOCK = threading.Lock()
+
 
 def _get_chroma_collection():
     """Get or create the ChromaDB collection for artifact chunks."""
+    global _COLLECTION
     if not CHROMA_AVAILABLE:
         return None
+    if _COLLECTION is not None:
+        return _COLLECTION
+
+    with _COLLECTION_LOCK:
+        if _COLLECTION is None:
+            _COLLECTION = _create_chroma_collection()
+    return _COLLECTION
+
 
+def _create_chroma_collection():
     client = chromadb.PersistentClient(path=CHROMA_DIR)
 
-    # Use the nomic-embed-text model via Ollama
+    # Embed via Ollama (nomic-embed-text unless overridden)
     ollama_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-    embed_fn = embedding_functions.OllamaEmbeddingFunction(
-        model_name="nomic-embed-text",
-        url=f"{ollama_url}/api/embeddings"
+    embed_fn = OllamaBatchEmbeddingFunction(
+        base_url=ollama_url,
+        model_name=get_artifact_embed_model(),
     )
 
     collection = client.get_or_create_collection(
         name=COLLECTION_NAME,
         embedding_function=embed_fn,
-        metadata={"hnsw:space": "cosine"}
+        metadata=COLLECTION_METADATA
     )
+    _manifest_bind_collection(str(collection.id))
     return collection
 
 
@@ -488,33 +730,120 @@ def _chunk_text(text: str, chunk_size: int = 1500, overlap: int = 200) -> list:
     Split text into overlapping chunks at paragraph boundaries.
     Prefers splitting at double-newlines (paragraph breaks).
     """
-    paragraphs = re.split(r"\n\n+", text)
     chunks = []
-    current_chunk = ""
-
-    for para in paragraphs:
-        if len(current_chunk) + len(para) > chunk_size and current_chunk:
-            chunks.append(current_chunk.strip())
+    # The current chunk is kept as a list of paragraphs plus the length it
+    # would have once joined, so it's only built when flushed rather than
+    # re-concatenated for every paragraph
+    current = []
+    current_len = 0
+
+    for para in _PARA_SPLIT_RE.split(text):
+        if current_len and current_len + len(para) > chunk_size:
+            joined = "\n\n".join(current)
+            chunks.append(joined.strip())
             # Overlap: keep last N characters
-            if overlap > 0 and len(current_chunk) > overlap:
-                current_chunk = current_chunk[-overlap:] + "\n\n" + para
+            if overlap > 0 and current_len > overlap:
+                tail = joined[-overlap:]
+                current = [tail, para]
+                current_len = len(tail) + 2 + len(para)
             else:
-                current_chunk = para
+                current = [para]
+                current_len = len(para)
+        elif current_len:
+            current.append(para)
+            current_len += 2 + len(para)
         else:
-            current_chunk = current_chunk + "\n\n" + para if current_chunk else para
+            current = [para]
+            current_len = len(para)
 
-    if current_chunk.strip():
-        chunks.append(current_chunk.strip())
+    joined = "\n\n".join(current)
+    if joined.strip():
+        chunks.append(joined.strip())
 
     return chunks
 
 
-def _file_hash(filepath: str) -> str:
+def _content_hash(data: bytes, mtime: float) -> str:
     """Hash of file content + mtime for change detection."""
-    stat = os.stat(filepath)
-    with open(filepath) as f:
-        content_hash = hashlib.md5(f.read().encode()).hexdigest()
-    return f"{content_hash}_{int(stat.st_mtime)}"
+    content_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+    return f"{content_hash}_{int(mtime)}"
+
+
+# prefix → file_hash of what's currently indexed, kept next to the Chroma
+# data so an unchanged artifact is recognized without touching the collection.
+# The file also records which collection (name, embed model and, once it has
+# been opened, its id) those hashes describe; a manifest written for any
+# other collection is treated as empty, so a re-created index is refilled.
+_MANIFEST_PATH = os.path.join(CHROMA_DIR, "_index_manifest.json")
+_MANIFEST = None
+_MANIFEST_LOCK = threading.Lock()
+
+
+def _manifest_identity() -> dict:
+    return {"collection": COLLECTION_NAME, "embed_model": get_artifact_embed_model()}
+
+
+def _load_manifest() -> dict:
+    global _MANIFEST
+    if _MANIFEST is None:
+        identity = _manifest_identity()
+        try:
+            with open(_MANIFEST_PATH) as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            stored = None
+        if (isinstance(stored, dict) and isinstance(stored.get("artifacts"), dict)
+                and all(stored.get(k) == v for k, v in identity.items())):
+            _MANIFEST = stored
+        else:
+            _MANIFEST = {**identity, "collection_id": None, "artifacts": {}}
+    return _MANIFEST
+
+
+def _manifest() -> dict:
+    """prefix → file_hash for the current collection."""
+    return _load_manifest()["artifacts"]
+
+
+def _write_manifest(manifest: dict):
+    """Flush the manifest atomically. Caller holds _MANIFEST_LOCK."""
+    try:
+        os.makedirs(os.path.dirname(_MANIFEST_PATH), exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=os.path.dirname(_MANIFEST_PATH), suffix=".tmp", delete=False
+        ) as f:
+            json.dump(manifest, f)
+            tmp_path = f.name
+        os.replace(tmp_path, _MANIFEST_PATH)
+    except OSError:
+        pass  # The manifest is only a shortcut; Chroma stays authoritative
+
+
+def _manifest_bind_collection(collection_id: str):
+    """
+    Tie the manifest to the collection actually opened.
+
+    If the collection was deleted and re-created (same name and model, new
+    id), the recorded hashes describe chunks that no longer exist: drop them.
+    """
+    with _MANIFEST_LOCK:
+        manifest = _load_manifest()
+        if manifest.get("collection_id") == collection_id:
+            return
+        if manifest.get("collection_id") is not None:
+            manifest["artifacts"] = {}
+        manifest["collection_id"] = collection_id
+        _write_manifest(manifest)
+
+
+def _manifest_record(prefix: str, file_hash: str):
+    """Record an indexed artifact and flush the manifest atomically."""
+    with _MANIFEST_LOCK:
+        manifest = _load_manifest()
+        if manifest["artifacts"].get(prefix) == file_hash:
+            return
+        manifest["artifacts"][prefix] = file_hash
+        _write_manifest(manifest)
 
 
 def index_artifact(filepath: str, artifact_type: str, project_id: str):
@@ -524,13 +853,24 @@ def index_artifact(filepath: str, artifact_type: str, project_id: str):
     Called by the orchestrator after each agent saves an artifact.
     Idempotent — re-indexes only if file has changed.
     """
-    collection = _get_chroma_collection()
-    if collection is None:
+    if not CHROMA_AVAILABLE:
         return  # ChromaDB not available, silently skip
 
-    file_hash = _file_hash(filepath)
+    # One read serves both the change-detection hash and the chunking
+    with open(filepath, "rb") as f:
+        data = f.read()
+        stat = os.fstat(f.fileno())
+    file_hash = _content_hash(data, stat.st_mtime)
     prefix = f"{project_id}_{artifact_type}"
 
+    # Unchanged since we last indexed it: no Chroma calls at all
+    if _manifest().get(prefix) == file_hash:
+        return
+
+    collection = _get_chroma_collection()
+    if collection is None:
+        return
+
     # Check if already indexed with same hash
     existing = collection.get(
         where={"source_prefix": prefix},
@@ -538,6 +878,7 @@ def index_artifact(filepath: str, artifact_type: str, project_id: str):
     )
     if existing and existing.get("metadatas"):
         if existing["metadatas"][0].get("file_hash") == file_hash:
+            _manifest_record(prefix, file_hash)
             return  # Already indexed, no change
 
     # Delete old chunks for this artifact
@@ -548,9 +889,10 @@ def index_artifact(filepath: str, artifact_type: str, project_id: str):
     except Exception:
         pass  # Collection may be empty
 
-    # Chunk and index
-    with open(filepath) as f:
-        text = f.read()
+    # Chunk and index (normalizing newlines as a text-mode read would)
+    text = data.decode("utf-8", errors="replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
 
     chunks = _chunk_text(text)
 
@@ -576,6 +918,7 @@ def index_artifact(filepath: str, artifact_type: str, project_id: str):
         documents=chunks,
         metadatas=metadatas
     )
+    _manifest_record(prefix, file_hash)
 
 
 def semantic_search(query: str, artifact_type: str = None,
@@ -625,6 +968,66 @@ def semantic_search(query: str, artifact_type: str = None,
     return "\n\n---\n\n".join(chunks)
 
 
+def semantic_search_batch(queries: list, project_id: str = None,
+                          n_results: int = 5) -> list:
+    """
+    semantic_search() for several (query, artifact_type) pairs in one
+    ChromaDB round-trip.
+
+    All queries share one where filter (artifact_type $in the requested
+    types), over-fetching n_results per type and splitting the hits by
+    artifact_type afterwards. When a query's results were cut off at the
+    limit before its type got n_results hits, that one query is re-run on
+    its own so every result matches what semantic_search would return.
+
+    Returns a list of result strings in the same order as queries.
+    """
+    if len(queries) <= 1:
+        return [semantic_search(query=q, artifact_type=atype,
+                                project_id=project_id, n_results=n_results)
+                for q, atype in queries]
+
+    collection = _get_chroma_collection()
+    if collection is None:
+        return [""] * len(queries)
+
+    types = list(dict.fromkeys(atype for _, atype in queries))
+    type_filter = {"artifact_type": {"$in": types}}
+    where_filter = {"$and": [type_filter, {"project_id": project_id}]} if project_id else type_filter
+    limit = n_results * len(types)
+
+    try:
+        results = collection.query(
+            query_texts=[q for q, _ in queries],
+            n_results=limit,
+            where=where_filter,
+            include=["documents", "metadatas"]
+        )
+    except Exception:
+        results = None
+
+    out = []
+    for i, (query, atype) in enumerate(queries):
+        try:
+            docs = results["documents"][i]
+            metas = results["metadatas"][i]
+        except (TypeError, KeyError, IndexError):
+            docs, metas = None, None
+        if docs is None:
+            chunks = None
+        else:
+            chunks = [d for d, m in zip(docs, metas)
+                      if (m or {}).get("artifact_type") == atype][:n_results]
+            if len(chunks) < n_results and len(docs) >= limit:
+                chunks = None  # truncated: this type may have more hits
+        if chunks is None:
+            out.append(semantic_search(query=query, artifact_type=atype,
+                                       project_id=project_id, n_results=n_results))
+        else:
+            out.append("\n\n---\n\n".join(chunks))
+    return out
+
+
 # ══════════════════════════════════════════════════════════════════
 #  UNIFIED API — what agents actually call
 # ══════════════════════════════════════════════════════════════════
@@ -652,45 +1055,89 @@ def get_context(filepath: str, artifact_type: str, consumer: str,
     Returns:
         Extracted context string, optimized for the consuming agent.
     """
-    if not filepath or not os.path.exists(filepath):
-        return ""
+    text, query_text = _local_context(filepath, artifact_type, consumer,
+                                      project_id, max_chars, semantic_queries)
+    if query_text is None:
+        return text
 
-    with open(filepath) as f:
-        full_text = f.read()
+    # ── Tier 2: Semantic search (ChromaDB) ────────────────────
+    semantic_result = semantic_search(
+        query=query_text,
+        artifact_type=artifact_type,
+        project_id=project_id,
+        n_results=5
+    )
+    return _semantic_or_fallback(semantic_result, text, max_chars)
 
-    # ── Tier 1: Section extraction ────────────────────────────
-    wanted = []
-    agent_map = CONTEXT_MAP.get(consumer, {})
-    wanted = agent_map.get(artifact_type, [])
 
+def _local_context(filepath: str, artifact_type: str, consumer: str,
+                   project_id: str, max_chars: int,
+                   semantic_queries: list = None) -> tuple:
+    """
+    Everything get_context does short of the ChromaDB round-trip.
+
+    Returns (context, None) when the answer is final, or
+    (full_text, query_text) when Tier 2 should be tried with query_text,
+    falling back to full_text if it comes up short.
+    """
+    if not filepath:
+        return "", None
+
+    plan = _PLANS.get((consumer, artifact_type))
+    wanted = plan.wanted if plan else []
+
+    # Missing or unreadable artifacts just contribute no context. Open or
+    # stat directly rather than checking exists() first: one syscall
+    # fewer, and no window for the file to vanish in between
+    try:
+        # Nothing to extract or search for: only the first max_chars are
+        # ever returned, so don't read (or parse) the rest of the file
+        if not wanted and not semantic_queries:
+            with open(filepath) as f:
+                return _truncate_fallback(f.read(max_chars + 1), max_chars), None
+
+        st = os.stat(filepath)
+        full_text, sections, index = _load_artifact(filepath, st.st_mtime_ns, st.st_size)
+    except OSError:
+        return "", None
+
+    # ── Tier 1: Section extraction ────────────────────────────
     extracted = ""
-    if wanted:
-        extracted = extract_sections(full_text, wanted, max_chars=max_chars)
+    if plan:
+        extracted = _extract_from_parsed(sections, index, plan.wanted_norm, max_chars=max_chars)
 
     # If we got meaningful content (>500 chars), use it
     if len(extracted) > 500:
-        return extracted[:max_chars]
+        return extracted[:max_chars], None
+
+    # ── Tier 2 needed? ────────────────────────────────────────
+    if project_id and _tier2_enabled():
+        if semantic_queries:
+            query_text = _semantic_query_text(semantic_queries)
+        else:
+            query_text = plan.query_text if plan else None
+        if query_text:
+            return full_text, query_text
+
+    # ── Tier 3: Fallback to first-N-chars ─────────────────────
+    return _truncate_fallback(full_text, max_chars), None
 
-    # ── Tier 2: Semantic search (ChromaDB) ────────────────────
-    if CHROMA_AVAILABLE and project_id:
-        queries = semantic_queries or wanted
-        if queries:
-            # Build a natural language query from section names
-            query_text = f"Sections about: {', '.join(queries[:5])}"
-            semantic_result = semantic_search(
-                query=query_text,
-                artifact_type=artifact_type,
-                project_id=project_id,
-                n_results=5
-            )
-            if len(semantic_result) > 500:
-                return semantic_result[:max_chars]
 
+def _semantic_or_fallback(semantic_result: str, full_text: str, max_chars: int) -> str:
+    if len(semantic_result) > 500:
+        return semantic_result[:max_chars]
     # ── Tier 3: Fallback to first-N-chars ─────────────────────
-    # Still better than nothing — but log a warning
-    if len(full_text) > max_chars:
-        return full_text[:max_chars] + "\n\n[...truncated — section extraction found no matching headings]"
-    return full_text
+    return _truncate_fallback(full_text, max_chars)
+
+
+def _truncate_fallback(text: str, max_chars: int) -> str:
+    """First-N-chars fallback. Still better than nothing — but log a warning."""
+    if len(text) > max_chars:
+        return text[:max_chars] + "\n\n[...truncated — section extraction found no matching headings]"
+    return text
+
+
+MULTI_CONTEXT_WORKERS = 8
 
 
 def get_multi_context(artifacts: dict, consumer: str,
@@ -699,6 +1146,9 @@ def get_multi_context(artifacts: dict, consumer: str,
     """
     Extract context from multiple artifacts for one agent.
 
+    Section extraction runs for every artifact first; the artifacts that
+    still need semantic search then share one batched ChromaDB query.
+
     Args:
         artifacts: Dict of {artifact_type: filepath}
                    e.g., {"BIR": "/path/to/BIR.md", "TAD": "/path/to/TAD.md"}
@@ -709,16 +1159,36 @@ def get_multi_context(artifacts: dict, consumer: str,
     Returns:
         Dict of {artifact_type: extracted_text}
     """
+    present = [(atype, path) for atype, path in artifacts.items() if path]
+
+    def _local(item):
+        atype, path = item
+        return _local_context(path, atype, consumer, project_id, max_chars_per_artifact)
+
+    # Per-artifact work is file I/O (or a cache hit), so fan out across
+    # threads; map() keeps results in artifact order
+    if len(present) > 1:
+        with ThreadPoolExecutor(max_workers=min(MULTI_CONTEXT_WORKERS, len(present))) as pool:
+            local_results = list(pool.map(_local, present))
+    else:
+        local_results = [_local(item) for item in present]
+
     result = {}
-    for atype, path in artifacts.items():
-        if path:
-            result[atype] = get_context(
-                filepath=path,
-                artifact_type=atype,
-                consumer=consumer,
-                project_id=project_id,
-                max_chars=max_chars_per_artifact
-            )
+    pending = {}
+    for (atype, _), (text, query_text) in zip(present, local_results):
+        result[atype] = text
+        if query_text is not None:
+            pending[atype] = query_text
+
+    if pending:
+        semantic_results = semantic_search_batch(
+            [(query_text, atype) for atype, query_text in pending.items()],
+            project_id=project_id,
+            n_results=5
+        )
+        for atype, semantic_result in zip(pending, semantic_results):
+            result[atype] = _semantic_or_fallback(
+                semantic_result, result[atype], max_chars_per_artifact)
     return result
 
 
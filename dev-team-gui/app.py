@@ -4,22 +4,62 @@ Dev-Team Mission Control — Flask Backend
 A GUI for Vibe Coders to monitor, control, and interact with the
 AI agent pipeline. Phase 1: reference guide + project viewer.
 Phase 2 hooks: live agent execution via subprocess.
+
+Run `python app.py` for local development, or
+`gunicorn -c gunicorn.conf.py app:app` to serve it (see gunicorn.conf.py).
 """
 
 import json
-import glob
+import fnmatch
+import gzip
+import hashlib
 import os
+import signal
+import sqlite3
 import subprocess
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from flask import Flask, render_template, jsonify, request, send_from_directory
+from types import MappingProxyType
+from flask import Flask, Response, render_template, jsonify, request, send_from_directory
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # fall back to stdlib json
+
+try:
+    import ijson
+except ImportError:
+    ijson = None  # summaries always come from a full parse
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None  # responses go out uncompressed
 
 app = Flask(__name__)
 
+# Project listings and the GUI page are repetitive text that shrinks a
+# lot under compression. /api/pipeline and /api/agents are precompressed
+# (see _static_json_response), so these settings don't touch them.
+if Compress is not None:
+    app.config.update(
+        COMPRESS_MIMETYPES=["application/json", "text/html"],
+        COMPRESS_ALGORITHM=["br", "gzip"],
+        COMPRESS_LEVEL=6,
+    )
+    Compress(app)
+
 # ── Configuration ──────────────────────────────────────────────
 # In production, point this to ~/dev-team/logs
 PROJECT_DIR = os.environ.get("DEVTEAM_PROJECT_DIR", os.path.expanduser("~/dev-team/logs"))
 AGENTS_DIR = os.environ.get("DEVTEAM_AGENTS_DIR", os.path.expanduser("~/dev-team/agents"))
+# Working directory agent commands are run from
+DEVTEAM_ROOT = os.path.expanduser("~/dev-team")
 
 # ── Pipeline Definition ───────────────────────────────────────
 # This is the single source of truth for agent ordering, commands,
@@ -79,6 +119,25 @@ PIPELINE = {
     ],
 }
 
+# Artifact type -> pipeline step ID, used to work out which steps a
+# project has completed. The pipeline is fixed, so build it once.
+_TYPE_TO_STEP = {}
+for _steps in PIPELINE.values():
+    for _step in _steps:
+        _TYPE_TO_STEP[_step["produces"].upper().replace(" ", "_")] = _step["id"]
+        # Also map common variations
+        _TYPE_TO_STEP[_step["produces"].upper()] = _step["id"]
+
+# Step ID -> step record / command, for handlers addressed by agent ID
+_AGENT_STEP = {step["id"]: step for steps in PIPELINE.values() for step in steps}
+_AGENT_CMD = {agent_id: step["command"] for agent_id, step in _AGENT_STEP.items()}
+_AGENT_ARGV = {agent_id: tuple(command.split()) for agent_id, command in _AGENT_CMD.items()}
+
+_CHECKPOINT_ACTIONS = frozenset({"APPROVE", "REJECT"})
+
+_TOTAL_WEB_STEPS = len(PIPELINE["web"])
+_TOTAL_MOBILE_STEPS = len(PIPELINE["mobile"])
+
 # Agent detail cards — for the reference guide section
 AGENT_DETAILS = {
     "product_mgr":   {"tier": "T1", "model": "qwen2.5:72b",        "file": "dev/strategy/product_manager.py",     "consumes": ["Project Spec"],          "produces": "PRD",           "description": "Turns your project description into a detailed requirements document — user stories, acceptance criteria, scope boundaries."},
@@ -120,42 +179,330 @@ AGENT_DETAILS = {
 
 # ── Helper Functions ──────────────────────────────────────────
 
+# Parsed project JSON keyed by path -> (st_mtime_ns, data). Every API call
+# scans the logs dir, but project files rarely change between calls.
+_PROJECT_CACHE = {}
+_PROJECT_CACHE_LOCK = threading.Lock()
+
+# Last sorted find_projects() result, keyed by the set of (path, mtime_ns)
+# it was built from; any file added, removed or touched invalidates it
+_PROJECT_LIST = (None, ())
+
+# Projects serialized per chunk when streaming /api/projects
+PROJECTS_STREAM_BATCH = 64
+
+# SQLite index of project summaries. The JSON files stay the source of
+# truth; the index lets a fresh process (or another worker) list projects
+# without re-parsing every file, only those whose mtime has moved on.
+PROJECT_INDEX_PATH = os.path.join(PROJECT_DIR, ".index.db")
+_INDEX_CONN = None
+_INDEX_LOCK = threading.Lock()
+
+SUMMARY_FIELDS = ("id", "status", "classification", "title", "created_at",
+                  "path", "artifact_count", "checkpoint_count")
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    id, status, classification, title, created_at,
+    artifact_count INTEGER,
+    checkpoint_count INTEGER
+);
+CREATE INDEX IF NOT EXISTS projects_created_at ON projects (created_at DESC);
+"""
+
+# Project files at least this big are summarized with a streaming parse
+# (when ijson is installed) instead of being loaded whole; below it the
+# streaming overhead outweighs building the dict
+SUMMARY_STREAM_MIN_BYTES = 64 * 1024
+
+_SUMMARY_SCALAR_KEYS = frozenset({"project_id", "status", "classification", "created_at"})
+_SCALAR_EVENTS = frozenset({"string", "number", "boolean", "null"})
+_ITEM_EVENTS = _SCALAR_EVENTS | {"start_map", "start_array"}
+
+# Shared pool for overlapping project file reads across a directory scan
+IO_WORKERS = 8
+_IO_POOL = ThreadPoolExecutor(max_workers=IO_WORKERS)
+
+
+def _read_json_cached(path, mtime_ns=None):
+    """
+    Return the parsed JSON at path, re-reading only when its mtime changes.
+
+    Pass mtime_ns when the caller already has it (e.g. from a DirEntry)
+    to skip the stat. The returned dict is shared between requests —
+    treat it as read-only.
+    """
+    if mtime_ns is None:
+        mtime_ns = os.stat(path).st_mtime_ns
+    with _PROJECT_CACHE_LOCK:
+        entry = _PROJECT_CACHE.get(path)
+    if entry and entry[0] == mtime_ns:
+        return entry[1]
+    if orjson is not None:
+        with open(path, "rb") as fh:
+            data = orjson.loads(fh.read())
+    else:
+        with open(path, "r") as fh:
+            data = json.load(fh)
+    with _PROJECT_CACHE_LOCK:
+        _PROJECT_CACHE[path] = (mtime_ns, data)
+    return data
+
+
+def _json_bytes(payload):
+    """
+    Serialize payload to compact JSON bytes, with orjson when it's installed.
+
+    Keys are sorted to match Flask's default provider, so the output is
+    the same either way.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+
+
+def _json_response(payload, status=200):
+    """jsonify() replacement built on _json_bytes."""
+    return Response(_json_bytes(payload), status=status, mimetype="application/json")
+
+
+def _iter_json_array(items, batch=PROJECTS_STREAM_BATCH):
+    """Yield a JSON array of items in chunks of `batch` serialized elements."""
+    yield b"["
+    for start in range(0, len(items), batch):
+        chunk = b",".join(_json_bytes(item) for item in items[start:start + batch])
+        yield b"," + chunk if start else chunk
+    yield b"]"
+
+
+PrebuiltJSON = namedtuple("PrebuiltJSON", ["body", "gzipped", "etag"])
+
+
+def _prebuild_json(payload):
+    """Serialize and gzip a constant payload once, for _static_json_response."""
+    body = _json_bytes(payload)
+    return PrebuiltJSON(body, gzip.compress(body, compresslevel=9, mtime=0),
+                        hashlib.blake2b(body, digest_size=8).hexdigest())
+
+
+def _static_json_response(prebuilt):
+    """
+    Serve a PrebuiltJSON, gzipped if the client accepts it.
+
+    Each encoding gets its own ETag, and a matching If-None-Match is
+    answered with a 304.
+    """
+    if request.accept_encodings["gzip"]:
+        response = Response(prebuilt.gzipped, mimetype="application/json")
+        response.headers["Content-Encoding"] = "gzip"
+        response.set_etag(prebuilt.etag + "-gz")
+    else:
+        response = Response(prebuilt.body, mimetype="application/json")
+        response.set_etag(prebuilt.etag)
+    response.vary.add("Accept-Encoding")
+    return response.make_conditional(request)
+
+
+# PIPELINE and AGENT_DETAILS never change at runtime: serialize them once
+_PIPELINE_JSON = _prebuild_json(PIPELINE)
+_AGENTS_JSON = _prebuild_json(AGENT_DETAILS)
+
+# Everything derived from the definitions is built, so make them read-only
+# — requests share them across threads and must not mutate them
+PIPELINE = MappingProxyType({name: tuple(steps) for name, steps in PIPELINE.items()})
+AGENT_DETAILS = MappingProxyType(AGENT_DETAILS)
+
+
+def _scan_project_entries():
+    """List DirEntry objects for the PROJ-*.json files in the logs directory."""
+    try:
+        with os.scandir(PROJECT_DIR) as it:
+            return [e for e in it
+                    if e.name.startswith("PROJ-") and e.name.endswith(".json")
+                    and e.is_file()]
+    except FileNotFoundError:
+        return []
+
+
+def _stream_summary(path):
+    """
+    _summarize() a project file from ijson events, without building it.
+
+    Only the handful of top-level fields the listing shows are kept, and
+    the artifacts/checkpoints arrays are counted rather than loaded.
+    Returns None when the file isn't shaped the way this expects (or
+    doesn't parse), so the caller can fall back to a full parse.
+    """
+    fields = {}
+    counts = {"artifacts": 0, "checkpoints": 0}
+    title = "Untitled"
+    try:
+        with open(path, "rb") as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if prefix in _SUMMARY_SCALAR_KEYS:
+                    if event not in _SCALAR_EVENTS:
+                        return None
+                    fields[prefix] = value
+                elif prefix == "artifacts.item" or prefix == "checkpoints.item":
+                    if event in _ITEM_EVENTS:
+                        counts[prefix[:-5]] += 1
+                elif prefix in counts or prefix == "structured_spec":
+                    if event in _SCALAR_EVENTS and event != "null":
+                        return None
+                elif prefix == "structured_spec.title":
+                    if event not in _SCALAR_EVENTS:
+                        return None
+                    title = value
+                elif prefix == "" and event == "start_array":
+                    return None
+    except ijson.JSONError:
+        return None
+    return {
+        "id": fields["project_id"] if "project_id" in fields else os.path.basename(path),
+        "status": fields.get("status", "UNKNOWN"),
+        "classification": fields.get("classification", "?"),
+        "title": title,
+        "created_at": fields.get("created_at", ""),
+        "path": path,
+        "artifact_count": counts["artifacts"],
+        "checkpoint_count": counts["checkpoints"],
+    }
+
+
+def _read_project_summary(entry):
+    """Listing summary for a scanned project file, or None if it can't be read."""
+    try:
+        st = entry.stat()
+        if ijson is not None and st.st_size >= SUMMARY_STREAM_MIN_BYTES:
+            summary = _stream_summary(entry.path)
+            if summary is not None:
+                return summary
+        return _summarize(_read_json_cached(entry.path, st.st_mtime_ns), entry.path)
+    except (json.JSONDecodeError, IOError):
+        return None
+
+
+def _summarize(data, path):
+    """Build the /api/projects list entry for one parsed project file."""
+    get = data.get
+    spec = get("structured_spec") or {}
+    return {
+        "id": data["project_id"] if "project_id" in data else os.path.basename(path),
+        "status": get("status", "UNKNOWN"),
+        "classification": get("classification", "?"),
+        "title": spec.get("title", "Untitled"),
+        "created_at": get("created_at", ""),
+        "path": path,
+        "artifact_count": len(get("artifacts") or ()),
+        "checkpoint_count": len(get("checkpoints") or ()),
+    }
+
+
+def _entry_mtime_ns(entry):
+    """A scanned entry's mtime, or None if it has vanished since the scan."""
+    try:
+        return entry.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _summarize_entries(entries):
+    """Summarize scanned project files, yielding (entry, summary or None) in order."""
+    # Cold reads are I/O-bound, so overlap them; cache hits are just a dict get
+    if len(entries) > 1:
+        return zip(entries, _IO_POOL.map(_read_project_summary, entries))
+    return zip(entries, map(_read_project_summary, entries))
+
+
+def _index_conn():
+    """The shared SQLite index connection, opened (WAL mode) on first use."""
+    global _INDEX_CONN
+    if _INDEX_CONN is None:
+        conn = sqlite3.connect(PROJECT_INDEX_PATH, timeout=5, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_INDEX_SCHEMA)
+        _INDEX_CONN = conn
+    return _INDEX_CONN
+
+
+def _sync_project_index(scanned):
+    """
+    Bring the SQLite index in line with a directory scan and list from it.
+
+    scanned maps DirEntry -> mtime_ns. Only files that are new or whose
+    mtime differs from the indexed row get parsed; rows for files that
+    are gone (or no longer parse) are dropped. Returns the summaries,
+    newest first. Raises sqlite3.Error if the index can't be used.
+    """
+    with _INDEX_LOCK:
+        conn = _index_conn()
+        indexed = dict(conn.execute("SELECT path, mtime_ns FROM projects"))
+    stale = [entry for entry, mtime_ns in scanned.items()
+             if mtime_ns is not None and indexed.get(entry.path) != mtime_ns]
+    upserts, deletes = [], []
+    for entry, summary in _summarize_entries(stale):
+        if summary is None:
+            deletes.append((entry.path,))
+            continue
+        upserts.append((scanned[entry], *(summary[f] for f in SUMMARY_FIELDS)))
+    current = {entry.path for entry in scanned}
+    deletes.extend((path,) for path in indexed.keys() - current)
+
+    with _INDEX_LOCK, conn:
+        if deletes:
+            conn.executemany("DELETE FROM projects WHERE path = ?", deletes)
+        if upserts:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO projects (mtime_ns, {', '.join(SUMMARY_FIELDS)}) "
+                f"VALUES ({', '.join('?' * (len(SUMMARY_FIELDS) + 1))})",
+                upserts,
+            )
+        rows = conn.execute(
+            f"SELECT {', '.join(SUMMARY_FIELDS)} FROM projects "
+            "ORDER BY created_at DESC, path"
+        ).fetchall()
+    return [dict(zip(SUMMARY_FIELDS, row)) for row in rows]
+
+
 def find_projects():
     """Find all PROJ-*.json files in the logs directory."""
-    pattern = os.path.join(PROJECT_DIR, "PROJ-*.json")
-    files = glob.glob(pattern)
-    projects = []
-    for f in files:
-        try:
-            with open(f, "r") as fh:
-                data = json.load(fh)
-                projects.append({
-                    "id": data.get("project_id", os.path.basename(f)),
-                    "status": data.get("status", "UNKNOWN"),
-                    "classification": data.get("classification", "?"),
-                    "title": data.get("structured_spec", {}).get("title", "Untitled"),
-                    "created_at": data.get("created_at", ""),
-                    "path": f,
-                    "artifact_count": len(data.get("artifacts", [])),
-                    "checkpoint_count": len(data.get("checkpoints", [])),
-                })
-        except (json.JSONDecodeError, IOError):
-            continue
-    projects.sort(key=lambda p: p["created_at"], reverse=True)
+    global _PROJECT_LIST
+    entries = _scan_project_entries()
+    scanned = {entry: _entry_mtime_ns(entry) for entry in entries}
+    # Nothing changed since the last call: reuse its sorted summaries
+    key = frozenset((entry.path, mtime_ns) for entry, mtime_ns in scanned.items())
+    with _PROJECT_CACHE_LOCK:
+        cached_key, cached = _PROJECT_LIST
+    if key == cached_key:
+        return list(cached)
+    try:
+        projects = _sync_project_index(scanned)
+    except sqlite3.Error:
+        # No usable index (e.g. read-only logs dir): summarize every file
+        projects = [summary for _, summary in _summarize_entries(entries)
+                    if summary is not None]
+        projects.sort(key=lambda p: p["created_at"], reverse=True)
+    with _PROJECT_CACHE_LOCK:
+        _PROJECT_LIST = (key, tuple(projects))
     return projects
 
 
 def load_project(project_id):
     """Load full project context JSON."""
-    pattern = os.path.join(PROJECT_DIR, f"{project_id}.json")
-    files = glob.glob(pattern)
-    if not files:
-        # Try partial match
-        pattern = os.path.join(PROJECT_DIR, f"*{project_id}*.json")
-        files = glob.glob(pattern)
-    if files:
-        with open(files[0], "r") as f:
-            return json.load(f)
+    path = os.path.join(PROJECT_DIR, f"{project_id}.json")
+    if os.path.isfile(path):
+        return _read_json_cached(path)
+    # Try partial match
+    pattern = f"*{project_id}*.json"
+    try:
+        with os.scandir(PROJECT_DIR) as it:
+            for entry in it:
+                if not entry.name.startswith(".") and fnmatch.fnmatch(entry.name, pattern):
+                    return _read_json_cached(entry.path)
+    except FileNotFoundError:
+        pass
     return None
 
 
@@ -167,20 +514,67 @@ def get_pipeline_status(project_data):
     artifact_types = {a.get("type", "").upper() for a in artifacts}
 
     # Map artifact types back to pipeline step IDs
-    type_to_step = {}
-    for pipeline_name, steps in PIPELINE.items():
-        for step in steps:
-            produces = step["produces"].upper().replace(" ", "_")
-            type_to_step[produces] = step["id"]
-            # Also map common variations
-            type_to_step[step["produces"].upper()] = step["id"]
+    return {_TYPE_TO_STEP[at] for at in artifact_types if at in _TYPE_TO_STEP}
+
+
+# Lines of stdout/stderr kept per subprocess; older output is dropped
+# so a chatty hour-long agent run can't grow the worker without bound
+OUTPUT_TAIL_LINES = 2000
+
+# Agent ID -> Popen for subprocesses currently running
+_RUNNING = {}
+_RUNNING_LOCK = threading.Lock()
+
+
+def _drain(pipe, tail):
+    """Read a subprocess pipe to EOF, keeping the last lines in tail."""
+    with pipe:
+        for line in pipe:
+            tail.append(line)
+
 
-    completed = set()
-    for at in artifact_types:
-        if at in type_to_step:
-            completed.add(type_to_step[at])
+def _run_captured(agent_id, argv, cwd, timeout):
+    """
+    Run argv to completion, capturing only the tail of its output.
 
-    return completed
+    The process gets its own session so a timeout can take down its whole
+    process group, and is registered in _RUNNING while it runs.
+    Returns (returncode, stdout_tail, stderr_tail); raises
+    subprocess.TimeoutExpired if it had to be killed.
+    """
+    proc = subprocess.Popen(argv, cwd=cwd, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, text=True,
+                            encoding="utf-8", errors="replace",
+                            start_new_session=True)
+    out_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+    err_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+    readers = [threading.Thread(target=_drain, args=(proc.stdout, out_tail), daemon=True),
+               threading.Thread(target=_drain, args=(proc.stderr, err_tail), daemon=True)]
+    for reader in readers:
+        reader.start()
+    with _RUNNING_LOCK:
+        _RUNNING[agent_id] = proc
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        # The group may exit on its own between the timeout and either kill
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        proc.wait()
+        raise
+    finally:
+        with _RUNNING_LOCK:
+            if _RUNNING.get(agent_id) is proc:
+                del _RUNNING[agent_id]
+        for reader in readers:
+            reader.join(timeout=5)
+    return proc.returncode, "".join(out_tail), "".join(err_tail)
 
 
 # ── Routes ────────────────────────────────────────────────────
@@ -194,13 +588,13 @@ def index():
 @app.route("/api/pipeline")
 def api_pipeline():
     """Return full pipeline definition."""
-    return jsonify(PIPELINE)
+    return _static_json_response(_PIPELINE_JSON)
 
 
 @app.route("/api/agents")
 def api_agents():
     """Return all agent detail cards."""
-    return jsonify(AGENT_DETAILS)
+    return _static_json_response(_AGENTS_JSON)
 
 
 @app.route("/api/agents/<agent_id>")
@@ -208,14 +602,16 @@ def api_agent_detail(agent_id):
     """Return single agent detail."""
     detail = AGENT_DETAILS.get(agent_id)
     if detail:
-        return jsonify(detail)
-    return jsonify({"error": "Agent not found"}), 404
+        return _json_response(detail)
+    return _json_response({"error": "Agent not found"}, 404)
 
 
 @app.route("/api/projects")
 def api_projects():
     """List all projects found in logs directory."""
-    return jsonify(find_projects())
+    # Stream the array rather than serializing it into one buffer — the
+    # list has to be sorted first, but its JSON never exists all at once
+    return Response(_iter_json_array(find_projects()), mimetype="application/json")
 
 
 @app.route("/api/projects/<project_id>")
@@ -223,8 +619,8 @@ def api_project_detail(project_id):
     """Return full project context."""
     data = load_project(project_id)
     if data:
-        return jsonify(data)
-    return jsonify({"error": "Project not found"}), 404
+        return _json_response(data)
+    return _json_response({"error": "Project not found"}, 404)
 
 
 @app.route("/api/projects/<project_id>/status")
@@ -232,11 +628,11 @@ def api_project_status(project_id):
     """Return pipeline completion status for a project."""
     data = load_project(project_id)
     completed = get_pipeline_status(data)
-    return jsonify({
+    return _json_response({
         "project_id": project_id,
         "completed_steps": list(completed),
-        "total_web_steps": len(PIPELINE["web"]),
-        "total_mobile_steps": len(PIPELINE["mobile"]),
+        "total_web_steps": _TOTAL_WEB_STEPS,
+        "total_mobile_steps": _TOTAL_MOBILE_STEPS,
     })
 
 
@@ -250,7 +646,7 @@ def api_create_project():
     Phase 1: Creates the PROJ JSON file directly (lightweight, no LLM needed).
     Phase 2: Optionally runs classify.py to have the Orchestrator structure it.
     """
-    data = request.json or {}
+    data = request.get_json(silent=True) or {}
     description = data.get("description", "").strip()
     if not description:
         return jsonify({"error": "Project description is required"}), 400
@@ -258,13 +654,14 @@ def api_create_project():
     title = data.get("title", "").strip()
     run_classify = data.get("run_classify", False)
 
-    # Generate project ID
-    import hashlib
-    hash_input = f"{description}{datetime.now().isoformat()}"
-    project_id = "PROJ-" + hashlib.sha256(hash_input.encode()).hexdigest()[:8].upper()
+    # Generate project ID — the raw nanosecond clock is as unique as an
+    # ISO string, and only 8 hex chars are kept so a short digest will do
+    ts_ns = time.time_ns()
+    hash_input = f"{description}{ts_ns}"
+    project_id = "PROJ-" + hashlib.blake2b(hash_input.encode(), digest_size=4).hexdigest().upper()
 
     # Build initial project context
-    now = datetime.now().isoformat() + "Z"
+    now = datetime.fromtimestamp(ts_ns / 1e9).isoformat() + "Z"
     project_context = {
         "project_id": project_id,
         "created_at": now,
@@ -299,9 +696,20 @@ def api_create_project():
     os.makedirs(PROJECT_DIR, exist_ok=True)
     project_path = os.path.join(PROJECT_DIR, f"{project_id}.json")
 
-    # Write the project file
-    with open(project_path, "w") as f:
-        json.dump(project_context, f, indent=2)
+    # Write the project file via a temp file + rename, so a crash mid-write
+    # can't leave a truncated PROJ-*.json behind for every scan to trip on
+    if orjson is not None:
+        payload = orjson.dumps(project_context, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(project_context, indent=2).encode()
+    tmp_path = project_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    try:
+        os.replace(tmp_path, project_path)
+    except OSError:
+        os.unlink(tmp_path)
+        raise
 
     result = {
         "status": "created",
@@ -313,18 +721,16 @@ def api_create_project():
 
     # Phase 2: Run the Orchestrator classify.py to structure the project
     if run_classify:
-        classify_cmd = PIPELINE["web"][0]["command"]  # classify.py
         try:
-            proc = subprocess.run(
-                classify_cmd.split(),
-                cwd=os.path.expanduser("~/dev-team"),
-                capture_output=True,
-                text=True,
+            returncode, stdout, stderr = _run_captured(
+                "classify",
+                _AGENT_ARGV["classify"],
+                cwd=DEVTEAM_ROOT,
                 timeout=300
             )
-            result["classify_status"] = "completed" if proc.returncode == 0 else "failed"
-            result["classify_stdout"] = proc.stdout[-2000:]
-            result["classify_stderr"] = proc.stderr[-500:]
+            result["classify_status"] = "completed" if returncode == 0 else "failed"
+            result["classify_stdout"] = stdout[-2000:]
+            result["classify_stderr"] = stderr[-500:]
             # Reload the project to get the structured version
             updated = load_project(project_id)
             if updated:
@@ -345,30 +751,23 @@ def api_run_agent(agent_id):
     PHASE 2 HOOK: Run an agent via subprocess.
     Currently returns a stub. When ready, uncomment the subprocess call.
     """
-    # Find the command for this agent
-    command = None
-    for pipeline_name, steps in PIPELINE.items():
-        for step in steps:
-            if step["id"] == agent_id:
-                command = step["command"]
-                break
+    command = _AGENT_CMD.get(agent_id)
     if not command:
         return jsonify({"error": "Agent not found"}), 404
 
     # Phase 2: Uncomment to enable live agent execution
     # try:
-    #     result = subprocess.run(
-    #         command.split(),
-    #         cwd=os.path.expanduser("~/dev-team"),
-    #         capture_output=True,
-    #         text=True,
+    #     returncode, stdout, stderr = _run_captured(
+    #         agent_id,
+    #         _AGENT_ARGV[agent_id],
+    #         cwd=DEVTEAM_ROOT,
     #         timeout=3600  # 1 hour timeout
     #     )
     #     return jsonify({
-    #         "status": "completed" if result.returncode == 0 else "failed",
-    #         "stdout": result.stdout[-2000:],  # Last 2000 chars
-    #         "stderr": result.stderr[-1000:],
-    #         "returncode": result.returncode
+    #         "status": "completed" if returncode == 0 else "failed",
+    #         "stdout": stdout[-2000:],  # Last 2000 chars
+    #         "stderr": stderr[-1000:],
+    #         "returncode": returncode
     #     })
     # except subprocess.TimeoutExpired:
     #     return jsonify({"status": "timeout", "error": "Agent timed out after 1 hour"})
@@ -380,15 +779,31 @@ def api_run_agent(agent_id):
     })
 
 
+@app.route("/api/run/<agent_id>/status")
+def api_run_status(agent_id):
+    """Report whether an agent subprocess is currently running."""
+    if agent_id not in _AGENT_CMD:
+        return jsonify({"error": "Agent not found"}), 404
+    with _RUNNING_LOCK:
+        proc = _RUNNING.get(agent_id)
+    running = proc is not None and proc.poll() is None
+    return jsonify({
+        "agent_id": agent_id,
+        "running": running,
+        "pid": proc.pid if running else None,
+    })
+
+
 @app.route("/api/checkpoint/<project_id>", methods=["POST"])
 def api_checkpoint_action(project_id):
     """
     PHASE 2 HOOK: Submit checkpoint approval/rejection.
     """
-    action = request.json.get("action", "").upper()
-    reason = request.json.get("reason", "")
+    body = request.get_json(silent=True) or {}
+    action = body.get("action", "").upper()
+    reason = body.get("reason", "")
 
-    if action not in ("APPROVE", "REJECT"):
+    if action not in _CHECKPOINT_ACTIONS:
         return jsonify({"error": "Action must be APPROVE or REJECT"}), 400
 
     # Phase 2: Write to project context and trigger next step
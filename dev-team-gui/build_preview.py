@@ -1,5 +1,15 @@
 """Build standalone preview.html with embedded sample data."""
-import json, sys, os, re
+import json, sys, os
+
+from jinja2 import Environment, FileSystemLoader
+
+try:
+    import orjson
+
+    def dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    dumps = json.dumps
 
 sys.path.insert(0, os.path.dirname(__file__))
 os.environ['DEVTEAM_PROJECT_DIR'] = '/home/claude/dev-team/logs'
@@ -7,18 +17,17 @@ os.environ['DEVTEAM_PROJECT_DIR'] = '/home/claude/dev-team/logs'
 from app import PIPELINE, AGENT_DETAILS
 
 # Load template
-with open('templates/index.html', 'r') as f:
-    html = f.read()
+env = Environment(loader=FileSystemLoader('templates'), keep_trailing_newline=True)
 
 # Load sample project
 with open('/home/claude/dev-team/logs/PROJ-A1B2C3D4.json', 'r') as f:
     sample_project = json.load(f)
 
 # Build embedded data
-pipeline_json = json.dumps(PIPELINE)
-agents_json = json.dumps(AGENT_DETAILS)
-project_json = json.dumps(sample_project)
-projects_list = json.dumps([{
+pipeline_json = dumps(dict(PIPELINE))
+agents_json = dumps(dict(AGENT_DETAILS))
+project_json = dumps(sample_project)
+projects_list = dumps([{
     'id': sample_project['project_id'],
     'status': sample_project['status'],
     'classification': sample_project['classification'],
@@ -28,7 +37,7 @@ projects_list = json.dumps([{
     'checkpoint_count': len(sample_project['checkpoints']),
 }])
 
-status_json = json.dumps({
+status_json = dumps({
     'project_id': 'PROJ-A1B2C3D4',
     'completed_steps': [
         'classify', 'route', 'product_mgr', 'biz_analyst', 'scrum_master',
@@ -55,21 +64,11 @@ new_fetch = f"""async function fetchJSON(url) {{
   return null;
 }}"""
 
-# Replace the original fetchJSON using string search
-marker_start = 'async function fetchJSON(url) {'
-start_idx = html.index(marker_start)
-# Find the closing brace by counting braces
-depth = 0
-end_idx = start_idx
-for i in range(start_idx, len(html)):
-    if html[i] == '{':
-        depth += 1
-    elif html[i] == '}':
-        depth -= 1
-        if depth == 0:
-            end_idx = i + 1
-            break
-result = html[:start_idx] + new_fetch + html[end_idx:]
+# Replace the original fetchJSON by overriding the template's fetch_json block
+preview = env.from_string(
+    '{% extends "index.html" %}{% block fetch_json %}{{ fetch_json }}{% endblock %}'
+)
+result = preview.render(fetch_json=new_fetch)
 
 # Write preview
 with open('preview.html', 'w') as f:
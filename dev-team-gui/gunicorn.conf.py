@@ -0,0 +1,26 @@
+"""
+Gunicorn config for Dev-Team Mission Control.
+
+    gunicorn -c gunicorn.conf.py app:app
+
+`python app.py` runs Flask's debug server, which is for local
+development only.
+"""
+
+import os
+
+bind = "0.0.0.0:5000"
+
+# Import app.py once in the arbiter and fork workers from it, so the
+# pipeline tables and prebuilt/precompressed JSON are built once and
+# shared copy-on-write. Anything that must not cross a fork (the read
+# thread pool's threads, the SQLite index connection) is created lazily
+# on first use inside each worker.
+preload_app = True
+
+workers = max(2, (os.cpu_count() or 2) // 2)
+worker_class = "gthread"
+threads = 8
+
+# classify.py runs inside the create-project request for up to 300s
+timeout = 330
@@ -6,15 +6,60 @@ AI agent pipeline. Phase 1: reference guide + project viewer.
 Phase 2 hooks: live agent execution via subprocess.
 """
 
+import hashlib
 import json
-import glob
 import os
 import subprocess
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from flask import Flask, render_template, jsonify, request, send_from_directory
+from flask import Flask, Response, render_template, jsonify, request, send_from_directory
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # stdlib json via Flask's default provider
+
+try:
+    import ijson
+except ImportError:
+    ijson = None  # listings fall back to a full parse per file
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None  # responses go out uncompressed
+
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson; output is always compact."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_SORT_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+if orjson is not None:
+    app.json = ORJSONProvider(app)
+# Compact JSON even under the debug server (which pretty-prints by default)
+app.json.compact = True
+
+# Project detail payloads carry full artifact arrays and compress well;
+# tiny bodies aren't worth the CPU
+if Compress is not None:
+    app.config.update(
+        COMPRESS_MIMETYPES=["application/json"],
+        COMPRESS_LEVEL=4,
+        COMPRESS_MIN_SIZE=1024,
+    )
+    Compress(app)
 
 # ── Configuration ──────────────────────────────────────────────
 # In production, point this to ~/dev-team/logs
@@ -84,70 +129,260 @@ AGENT_DETAILS = {
     "mobile_qa":     {"tier": "T1", "model": "qwen2.5:72b",        "file": "mobile/qa/mobile_qa_specialist.py",   "consumes": ["RN Guide", "MUXD", "MDIR"], "produces": "Test Suite", "description": "Writes and runs the mobile test suite — Jest, RNTL, Detox E2E, accessibility, and performance tests."},
 }
 
+# Flattened step columns (web then mobile), pulled out of the step dicts
+# once so status lookups never touch PIPELINE; PIPELINE itself is only
+# used for API output
+_STEP_IDS = tuple(step["id"] for steps in PIPELINE.values() for step in steps)
+_PRODUCES_UPPER = tuple(step["produces"].upper() for steps in PIPELINE.values() for step in steps)
+
+# Artifact type -> pipeline step ID, for working out completed steps
+_TYPE_TO_STEP = {}
+for _step_id, _produces in zip(_STEP_IDS, _PRODUCES_UPPER):
+    _TYPE_TO_STEP[_produces.replace(" ", "_")] = _step_id
+    # Also map common variations
+    _TYPE_TO_STEP[_produces] = _step_id
+_TYPE_TO_STEP_KEYS = frozenset(_TYPE_TO_STEP)
+
+# PIPELINE and AGENT_DETAILS never change at runtime: serialize them once.
+# Keys stay sorted, as jsonify() sorts them and the GUI flattens the
+# pipeline in key order.
+_PIPELINE_JSON = app.json.dumps(PIPELINE, separators=(",", ":")).encode()
+_AGENTS_JSON = app.json.dumps(AGENT_DETAILS, separators=(",", ":")).encode()
+_PIPELINE_ETAG = hashlib.blake2b(_PIPELINE_JSON, digest_size=8).hexdigest()
+_AGENTS_ETAG = hashlib.blake2b(_AGENTS_JSON, digest_size=8).hexdigest()
+
+# How long browsers may reuse /api/pipeline and /api/agents without asking;
+# after that (or on a reload) the ETag turns the refetch into a 304
+STATIC_MAX_AGE = 86400
+
+
+# Long-running subprocesses (classify.py, later agent runs) go to this pool
+# so a request thread never waits on an LLM; results are polled through
+# /api/jobs/<job_id>
+JOB_WORKERS = 4
+# A job is dropped once /api/jobs has reported it finished; jobs nobody
+# polls are evicted oldest-first beyond this many
+JOB_HISTORY = 256
+_job_pool = ThreadPoolExecutor(max_workers=JOB_WORKERS)
+_jobs = {}
+_jobs_lock = threading.Lock()
+
 
 # ── Helper Functions ──────────────────────────────────────────
 
+# Parsed project JSON keyed by path -> (st_mtime_ns, data), shared by the
+# listing, detail and status endpoints
+_project_cache = {}
+_project_cache_lock = threading.Lock()
+
+
+def _load_cached(path):
+    """
+    Return the parsed JSON at path, re-reading only when its mtime changes.
+
+    The returned dict is shared between requests — treat it as read-only.
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    with _project_cache_lock:
+        cached = _project_cache.get(path)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+    with open(path, "rb") as f:
+        data = app.json.loads(f.read())
+    with _project_cache_lock:
+        _project_cache[path] = (mtime_ns, data)
+    return data
+
+
+def _scan_project_entries():
+    """DirEntry objects for the PROJ-*.json files in the logs directory, in one readdir."""
+    try:
+        with os.scandir(PROJECT_DIR) as it:
+            return [e for e in it
+                    if e.name.startswith("PROJ-") and e.name.endswith(".json")
+                    and e.is_file()]
+    except FileNotFoundError:
+        return []
+
+
+SUMMARY_FIELDS = ("id", "status", "classification", "title", "created_at",
+                  "path", "artifact_count", "checkpoint_count")
+
+_SUMMARY_SCALAR_KEYS = frozenset({"project_id", "status", "classification", "created_at"})
+_SCALAR_EVENTS = frozenset({"string", "number", "boolean", "null"})
+_ITEM_EVENTS = _SCALAR_EVENTS | {"start_map", "start_array"}
+
+
+def _stream_summary(path):
+    """
+    Build a project's listing entry from ijson events, without loading it.
+
+    Only the top-level fields the listing shows are kept; the artifacts
+    and checkpoints arrays are counted, not built. Returns None when the
+    file isn't shaped the way this expects (or doesn't parse), so the
+    caller can fall back to a full parse.
+    """
+    fields = {}
+    counts = {"artifacts": 0, "checkpoints": 0}
+    title = "Untitled"
+    try:
+        with open(path, "rb") as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if prefix in _SUMMARY_SCALAR_KEYS:
+                    if event not in _SCALAR_EVENTS:
+                        return None
+                    fields[prefix] = value
+                elif prefix == "artifacts.item" or prefix == "checkpoints.item":
+                    if event in _ITEM_EVENTS:
+                        counts[prefix[:-5]] += 1
+                elif prefix in counts or prefix == "structured_spec":
+                    if event in _SCALAR_EVENTS:
+                        return None
+                elif prefix == "structured_spec.title":
+                    if event not in _SCALAR_EVENTS:
+                        return None
+                    title = value
+                elif prefix == "" and event == "start_array":
+                    return None
+    except ijson.JSONError:
+        return None
+    return {
+        "id": fields["project_id"] if "project_id" in fields else os.path.basename(path),
+        "status": fields.get("status", "UNKNOWN"),
+        "classification": fields.get("classification", "?"),
+        "title": title,
+        "created_at": fields.get("created_at", ""),
+        "path": path,
+        "artifact_count": counts["artifacts"],
+        "checkpoint_count": counts["checkpoints"],
+    }
+
+
+# Listing entries keyed by path -> (mtime_ns, size, summary or None).
+# find_projects() prunes it to the current scan, so it holds one entry per
+# project file however many there are.
+_summary_cache = {}
+_summary_cache_lock = threading.Lock()
+
+
+def _project_summary(f):
+    """
+    Listing fields for one project file, as a tuple in SUMMARY_FIELDS order.
+
+    Returns None for a file that isn't valid JSON.
+    """
+    try:
+        summary = _stream_summary(f) if ijson is not None else None
+        if summary is None:
+            data = _load_cached(f)
+            summary = {
+                "id": data.get("project_id", os.path.basename(f)),
+                "status": data.get("status", "UNKNOWN"),
+                "classification": data.get("classification", "?"),
+                "title": data.get("structured_spec", {}).get("title", "Untitled"),
+                "created_at": data.get("created_at", ""),
+                "path": f,
+                "artifact_count": len(data.get("artifacts", [])),
+                "checkpoint_count": len(data.get("checkpoints", [])),
+            }
+    except json.JSONDecodeError:
+        return None
+    return tuple(summary[field] for field in SUMMARY_FIELDS)
+
+
+def _summary_for(key):
+    """
+    _project_summary for a (path, mtime_ns, size) key; None if unreadable.
+
+    Unchanged files are parsed once; an edited file no longer matches its
+    cached mtime/size and is re-read.
+    """
+    path, mtime_ns, size = key
+    with _summary_cache_lock:
+        cached = _summary_cache.get(path)
+    if cached is not None and cached[0] == mtime_ns and cached[1] == size:
+        return cached[2]
+    try:
+        summary = _project_summary(path)
+    except IOError:
+        return None
+    with _summary_cache_lock:
+        _summary_cache[path] = (mtime_ns, size, summary)
+    return summary
+
+
+# Max threads for parsing new or changed project files
+LISTING_WORKERS = 16
+
+
 def find_projects():
     """Find all PROJ-*.json files in the logs directory."""
-    pattern = os.path.join(PROJECT_DIR, "PROJ-*.json")
-    files = glob.glob(pattern)
-    projects = []
-    for f in files:
+    keys = []
+    for entry in _scan_project_entries():
         try:
-            with open(f, "r") as fh:
-                data = json.load(fh)
-                projects.append({
-                    "id": data.get("project_id", os.path.basename(f)),
-                    "status": data.get("status", "UNKNOWN"),
-                    "classification": data.get("classification", "?"),
-                    "title": data.get("structured_spec", {}).get("title", "Untitled"),
-                    "created_at": data.get("created_at", ""),
-                    "path": f,
-                    "artifact_count": len(data.get("artifacts", [])),
-                    "checkpoint_count": len(data.get("checkpoints", [])),
-                })
-        except (json.JSONDecodeError, IOError):
+            st = entry.stat()
+        except IOError:
             continue
+        keys.append((entry.path, st.st_mtime_ns, st.st_size))
+    current = {key[0] for key in keys}
+    with _summary_cache_lock:
+        # Forget files that are gone
+        for path in _summary_cache.keys() - current:
+            del _summary_cache[path]
+        # New or changed files: no cached summary for this mtime/size
+        fresh = [key for key in keys
+                 if _summary_cache.get(key[0], (None, None))[:2] != key[1:]]
+    # Parse those concurrently; a repeat scan of an unchanged dir has
+    # nothing fresh and skips the pool
+    parsed = {}
+    if len(fresh) > 1:
+        with ThreadPoolExecutor(max_workers=min(LISTING_WORKERS, len(fresh))) as pool:
+            parsed = dict(zip(fresh, pool.map(_summary_for, fresh)))
+    projects = []
+    for key in keys:
+        summary = parsed[key] if key in parsed else _summary_for(key)
+        if summary is not None:
+            projects.append(dict(zip(SUMMARY_FIELDS, summary)))
     projects.sort(key=lambda p: p["created_at"], reverse=True)
     return projects
 
 
+def find_project_path(project_id):
+    """Path of a project's JSON file (exact ID first, then partial), or None."""
+    path = os.path.join(PROJECT_DIR, f"{project_id}.json")
+    if not os.path.isfile(path):
+        # Try partial match
+        path = None
+        try:
+            with os.scandir(PROJECT_DIR) as it:
+                for entry in it:
+                    name = entry.name
+                    if (name.endswith(".json") and not name.startswith(".")
+                            and project_id in name[:-5]):
+                        path = entry.path
+                        break
+        except FileNotFoundError:
+            pass
+    return path
+
+
 def load_project(project_id):
     """Load full project context JSON."""
-    pattern = os.path.join(PROJECT_DIR, f"{project_id}.json")
-    files = glob.glob(pattern)
-    if not files:
-        # Try partial match
-        pattern = os.path.join(PROJECT_DIR, f"*{project_id}*.json")
-        files = glob.glob(pattern)
-    if files:
-        with open(files[0], "r") as f:
-            return json.load(f)
+    path = find_project_path(project_id)
+    if path:
+        return _load_cached(path)
     return None
 
 
 def get_pipeline_status(project_data):
     """Determine which agents have completed based on project artifacts."""
     if not project_data:
-        return {}
+        return frozenset()
     artifacts = project_data.get("artifacts", [])
-    artifact_types = {a.get("type", "").upper() for a in artifacts}
+    artifact_types = set(a.get("type", "").upper() for a in artifacts)
 
     # Map artifact types back to pipeline step IDs
-    type_to_step = {}
-    for pipeline_name, steps in PIPELINE.items():
-        for step in steps:
-            produces = step["produces"].upper().replace(" ", "_")
-            type_to_step[produces] = step["id"]
-            # Also map common variations
-            type_to_step[step["produces"].upper()] = step["id"]
-
-    completed = set()
-    for at in artifact_types:
-        if at in type_to_step:
-            completed.add(type_to_step[at])
-
-    return completed
+    return frozenset(_TYPE_TO_STEP[at] for at in artifact_types & _TYPE_TO_STEP_KEYS)
 
 
 # ── Routes ────────────────────────────────────────────────────
@@ -161,13 +396,22 @@ def index():
 @app.route("/api/pipeline")
 def api_pipeline():
     """Return full pipeline definition."""
-    return jsonify(PIPELINE)
+    return _static_json_response(_PIPELINE_JSON, _PIPELINE_ETAG)
 
 
 @app.route("/api/agents")
 def api_agents():
     """Return all agent detail cards."""
-    return jsonify(AGENT_DETAILS)
+    return _static_json_response(_AGENTS_JSON, _AGENTS_ETAG)
+
+
+def _static_json_response(body, etag):
+    """Serve pre-serialized JSON that is fixed for the life of the process."""
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = STATIC_MAX_AGE
+    return response.make_conditional(request)
 
 
 @app.route("/api/agents/<agent_id>")
@@ -188,10 +432,17 @@ def api_projects():
 @app.route("/api/projects/<project_id>")
 def api_project_detail(project_id):
     """Return full project context."""
-    data = load_project(project_id)
-    if data:
-        return jsonify(data)
-    return jsonify({"error": "Project not found"}), 404
+    path = find_project_path(project_id)
+    if not path:
+        return jsonify({"error": "Project not found"}), 404
+    # Serve the file as-is: no parse/re-encode, and ETag/Last-Modified let
+    # a polling GUI get 304s until the project actually changes
+    response = send_from_directory(PROJECT_DIR, os.path.basename(path),
+                                   mimetype="application/json", conditional=True)
+    if Compress is not None:
+        # Flask-Compress skips passthrough (file) bodies; 304s stay empty
+        response.direct_passthrough = False
+    return response
 
 
 @app.route("/api/projects/<project_id>/status")
@@ -226,9 +477,8 @@ def api_create_project():
     run_classify = data.get("run_classify", False)
 
     # Generate project ID
-    import hashlib
     hash_input = f"{description}{datetime.now().isoformat()}"
-    project_id = "PROJ-" + hashlib.sha256(hash_input.encode()).hexdigest()[:8].upper()
+    project_id = "PROJ-" + hashlib.blake2b(hash_input.encode(), digest_size=4).hexdigest().upper()
 
     # Build initial project context
     now = datetime.now().isoformat() + "Z"
@@ -267,8 +517,12 @@ def api_create_project():
     project_path = os.path.join(PROJECT_DIR, f"{project_id}.json")
 
     # Write the project file
-    with open(project_path, "w") as f:
-        json.dump(project_context, f, indent=2)
+    if orjson is not None:
+        payload = orjson.dumps(project_context)
+    else:
+        payload = json.dumps(project_context, separators=(",", ":")).encode()
+    with open(project_path, "wb") as f:
+        f.write(payload)
 
     result = {
         "status": "created",
@@ -278,34 +532,68 @@ def api_create_project():
         "next_step": "Run classify.py to structure the project, then router.py to assign a crew."
     }
 
-    # Phase 2: Run the Orchestrator classify.py to structure the project
+    # Phase 2: Run the Orchestrator classify.py to structure the project.
+    # It can take minutes, so it runs as a background job the GUI polls.
     if run_classify:
-        classify_cmd = PIPELINE["web"][0]["command"]  # classify.py
-        try:
-            proc = subprocess.run(
-                classify_cmd.split(),
-                cwd=os.path.expanduser("~/dev-team"),
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-            result["classify_status"] = "completed" if proc.returncode == 0 else "failed"
-            result["classify_stdout"] = proc.stdout[-2000:]
-            result["classify_stderr"] = proc.stderr[-500:]
-            # Reload the project to get the structured version
-            updated = load_project(project_id)
-            if updated:
-                result["status"] = updated.get("status", "INITIATED")
-                result["classification"] = updated.get("classification", "UNKNOWN")
-        except subprocess.TimeoutExpired:
-            result["classify_status"] = "timeout"
-        except FileNotFoundError:
-            result["classify_status"] = "not_found"
-            result["classify_message"] = "classify.py not found — project file created but not classified"
+        job_id = uuid.uuid4().hex
+        future = _job_pool.submit(_run_classify, project_id)
+        with _jobs_lock:
+            _jobs[job_id] = future
+            while len(_jobs) > JOB_HISTORY:
+                del _jobs[next(iter(_jobs))]
+        result["job_id"] = job_id
+        result["classify_status"] = "running"
+        return jsonify(result), 202
 
     return jsonify(result), 201
 
 
+def _run_classify(project_id):
+    """Run classify.py for a freshly created project and report the outcome."""
+    result = {}
+    classify_cmd = PIPELINE["web"][0]["command"]  # classify.py
+    try:
+        proc = subprocess.run(
+            classify_cmd.split(),
+            cwd=os.path.expanduser("~/dev-team"),
+            capture_output=True,
+            text=True,
+            timeout=300
+        )
+        result["classify_status"] = "completed" if proc.returncode == 0 else "failed"
+        result["classify_stdout"] = proc.stdout[-2000:]
+        result["classify_stderr"] = proc.stderr[-500:]
+        # Reload the project to get the structured version
+        updated = load_project(project_id)
+        if updated:
+            result["status"] = updated.get("status", "INITIATED")
+            result["classification"] = updated.get("classification", "UNKNOWN")
+    except subprocess.TimeoutExpired:
+        result["classify_status"] = "timeout"
+    except FileNotFoundError:
+        result["classify_status"] = "not_found"
+        result["classify_message"] = "classify.py not found — project file created but not classified"
+    return result
+
+
+@app.route("/api/jobs/<job_id>")
+def api_job_status(job_id):
+    """Poll a background job started by another endpoint."""
+    with _jobs_lock:
+        future = _jobs.get(job_id)
+    if future is None:
+        return jsonify({"error": "Job not found"}), 404
+    if not future.done():
+        return jsonify({"job_id": job_id, "done": False, "result": None})
+    # Finished results are reported once, then forgotten
+    with _jobs_lock:
+        _jobs.pop(job_id, None)
+    error = future.exception()
+    if error is not None:
+        return jsonify({"job_id": job_id, "done": True, "result": None, "error": str(error)})
+    return jsonify({"job_id": job_id, "done": True, "result": future.result()})
+
+
 @app.route("/api/run/<agent_id>", methods=["POST"])
 def api_run_agent(agent_id):
     """